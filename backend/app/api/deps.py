@@ -1,11 +1,15 @@
-from fastapi import Depends, HTTPException, status
+from datetime import date as DateType
+
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from app.config import settings
 from app.models.user import User
 from app.services.auth_service import get_user_from_token
+from app.services.day_context import DayContext
 
 security = HTTPBearer(auto_error=not settings.single_user_mode)
+optional_security = HTTPBearer(auto_error=False)
 
 # Module-level cache for the single user (avoids DB lookup on every request)
 _single_user: User | None = None
@@ -47,3 +51,33 @@ async def get_current_user(
             detail="Account disabled",
         )
     return user
+
+
+async def get_optional_user(
+    credentials: HTTPAuthorizationCredentials | None = Depends(optional_security),
+) -> User | None:
+    """The signed-in user, or None for an anonymous request."""
+    if settings.single_user_mode:
+        return await _get_single_user()
+    if not credentials:
+        return None
+    user = await get_user_from_token(credentials.credentials)
+    if not user or not user.is_active:
+        return None
+    return user
+
+
+async def get_day_context(
+    target_date: DateType = Query(default_factory=DateType.today),
+    user: User = Depends(get_current_user),
+) -> DayContext:
+    """Request-scoped loader for the user's day (FastAPI caches it per request)."""
+    return DayContext(user=user, date=target_date)
+
+
+async def get_dashboard_day_context(
+    day: DateType = Query(default_factory=DateType.today, alias="date"),
+    user: User = Depends(get_current_user),
+) -> DayContext:
+    """``get_day_context`` for ``GET /dashboard?date=``, which takes ``date``."""
+    return DayContext(user=user, date=day)
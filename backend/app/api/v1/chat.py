@@ -12,7 +12,7 @@ from app.config import settings
 from app.models.chat_session import ChatSession
 from app.models.user import User
 from app.services.ai.checkpointer import get_checkpointer
-from app.services.ai.graph import build_agent_graph
+from app.services.ai.graph import get_agent_graph
 from app.services.auth_service import get_user_from_token
 
 logger = logging.getLogger(__name__)
@@ -105,6 +105,10 @@ async def get_session_messages(session_id: str, user: User = Depends(get_current
 
     messages = state["channel_values"].get("messages", [])
     result = []
+    # Older turns are replaced by a summary once a session outgrows its context
+    summary = state["channel_values"].get("summary")
+    if summary:
+        result.append(ChatMessageOut(role="assistant", content=f"Earlier in this chat: {summary}"))
     for msg in messages:
         if msg.type == "human":
             result.append(ChatMessageOut(role="user", content=msg.content))
@@ -153,8 +157,7 @@ async def chat_websocket(websocket: WebSocket):
         await websocket.close()
         return
 
-    checkpointer = get_checkpointer()
-    graph = build_agent_graph(checkpointer)
+    graph = get_agent_graph()
 
     try:
         while True:
@@ -0,0 +1,43 @@
+from datetime import date as DateType
+
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel
+
+from app.api.deps import get_dashboard_day_context
+from app.schemas.checklist import ChecklistItemResponse, item_response
+from app.schemas.food_log import DailyTotals, FoodLogEntry, entry_response, totals_response
+from app.services.checklist_service import get_day_checklist
+from app.services.daily_insights import generate_daily_insights
+from app.services.day_context import DayContext
+from app.services.nutrient_alerts import check_nutrient_alerts
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+class DashboardResponse(BaseModel):
+    date: DateType
+    entries: list[FoodLogEntry]
+    totals: DailyTotals
+    insights: list[dict]
+    alerts: list[dict]
+    checklist: list[ChecklistItemResponse]
+
+
+@router.get("/", response_model=DashboardResponse)
+async def get_dashboard(ctx: DayContext = Depends(get_dashboard_day_context)):
+    """Everything the dashboard shows for a day, loaded from one shared day context."""
+    # Load entries first so the totals are derived from them instead of queried again
+    entries = await ctx.entries()
+    summary = await ctx.summary()
+    insights = await generate_daily_insights(ctx)
+    alerts = await check_nutrient_alerts(ctx)
+    checklist = await get_day_checklist(ctx)
+
+    return DashboardResponse(
+        date=ctx.date,
+        entries=[entry_response(e) for e in entries],
+        totals=totals_response(summary),
+        insights=insights,
+        alerts=alerts,
+        checklist=[item_response(i) for i in checklist],
+    )
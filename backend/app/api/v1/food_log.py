@@ -1,66 +1,22 @@
 from datetime import date as DateType
+from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_day_context
 from app.models.food_log import FoodLog
 from app.models.user import User
+from app.schemas.food_log import DailyTotals, FoodLogEntry, entry_response, totals_response
 from app.services.daily_insights import generate_daily_insights
+from app.services.daily_summary import get_range_summaries
+from app.services.day_context import DayContext
+from app.services.food_log_service import delete_entries, insert_entries
 from app.services.nutrient_alerts import check_nutrient_alerts
 
 router = APIRouter(prefix="/food-log", tags=["food-log"])
 
-
-class FoodLogEntry(BaseModel):
-    id: str
-    date: DateType
-    meal: str
-    food_id: str | None
-    food_name: str
-    serving_label: str
-    quantity: float
-    calories: float
-    protein_g: float
-    carbs_g: float
-    fat_g: float
-    fiber_g: float
-    sugar_g: float
-    sodium_mg: float
-    saturated_fat_g: float
-
-
-class DailyTotals(BaseModel):
-    date: DateType
-    calories: float
-    protein_g: float
-    carbs_g: float
-    fat_g: float
-    fiber_g: float
-    sugar_g: float
-    sodium_mg: float
-    saturated_fat_g: float
-    entry_count: int
-
-
-def _entry_response(entry: FoodLog) -> FoodLogEntry:
-    return FoodLogEntry(
-        id=str(entry.id),
-        date=entry.date,
-        meal=entry.meal,
-        food_id=entry.food_id,
-        food_name=entry.food_name,
-        serving_label=entry.serving_label,
-        quantity=entry.quantity,
-        calories=entry.calories,
-        protein_g=entry.protein_g,
-        carbs_g=entry.carbs_g,
-        fat_g=entry.fat_g,
-        fiber_g=entry.fiber_g,
-        sugar_g=entry.sugar_g,
-        sodium_mg=entry.sodium_mg,
-        saturated_fat_g=entry.saturated_fat_g,
-    )
+MAX_BATCH_SIZE = 500
 
 
 class LogFoodRequest(BaseModel):
@@ -80,13 +36,9 @@ class LogFoodRequest(BaseModel):
     date: DateType | None = None
 
 
-@router.post("/", response_model=FoodLogEntry, status_code=201)
-async def log_food(
-    data: LogFoodRequest,
-    user: User = Depends(get_current_user),
-):
-    entry = FoodLog(
-        user_id=str(user.id),
+def _entry_from_request(data: LogFoodRequest, user_id: str) -> FoodLog:
+    return FoodLog(
+        user_id=user_id,
         date=data.date or DateType.today(),
         meal=data.meal,
         food_id=data.food_id,
@@ -102,45 +54,70 @@ async def log_food(
         sodium_mg=data.sodium_mg,
         saturated_fat_g=data.saturated_fat_g,
     )
-    await entry.insert()
-    return _entry_response(entry)
 
 
-@router.get("/", response_model=list[FoodLogEntry])
-async def get_entries(
-    target_date: DateType = Query(default_factory=DateType.today),
+@router.post("/", response_model=FoodLogEntry, status_code=201)
+async def log_food(
+    data: LogFoodRequest,
     user: User = Depends(get_current_user),
 ):
-    entries = await FoodLog.find(
-        FoodLog.user_id == str(user.id),
-        FoodLog.date == target_date,
-    ).sort("+meal", "+created_at").to_list()
-    return [_entry_response(e) for e in entries]
+    entry = _entry_from_request(data, str(user.id))
+    errors = await insert_entries([entry])
+    if errors:
+        raise HTTPException(status_code=500, detail=errors[0])
+    return entry_response(entry)
 
 
-@router.get("/totals", response_model=DailyTotals)
-async def get_daily_totals(
-    target_date: DateType = Query(default_factory=DateType.today),
+class BatchLogRequest(BaseModel):
+    items: list[LogFoodRequest] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    ok: bool
+    entry: FoodLogEntry | None = None
+    error: str | None = None
+
+
+class BatchLogResponse(BaseModel):
+    inserted: int
+    failed: int
+    results: list[BatchItemResult]
+
+
+@router.post("/batch", response_model=BatchLogResponse, status_code=201)
+async def log_food_batch(
+    data: BatchLogRequest,
     user: User = Depends(get_current_user),
 ):
-    entries = await FoodLog.find(
-        FoodLog.user_id == str(user.id),
-        FoodLog.date == target_date,
-    ).to_list()
-
-    totals = DailyTotals(
-        date=target_date,
-        calories=sum(e.calories for e in entries),
-        protein_g=sum(e.protein_g for e in entries),
-        carbs_g=sum(e.carbs_g for e in entries),
-        fat_g=sum(e.fat_g for e in entries),
-        fiber_g=sum(e.fiber_g for e in entries),
-        sugar_g=sum(e.sugar_g for e in entries),
-        sodium_mg=sum(e.sodium_mg for e in entries),
-        saturated_fat_g=sum(e.saturated_fat_g for e in entries),
-        entry_count=len(entries),
+    """Log many entries in one write. Failures are reported per item, not for the whole batch."""
+    user_id = str(user.id)
+    entries = [_entry_from_request(item, user_id) for item in data.items]
+    errors = await insert_entries(entries)
+
+    results = [
+        BatchItemResult(index=i, ok=False, error=errors[i])
+        if i in errors
+        else BatchItemResult(index=i, ok=True, entry=entry_response(e))
+        for i, e in enumerate(entries)
+    ]
+    return BatchLogResponse(
+        inserted=len(entries) - len(errors),
+        failed=len(errors),
+        results=results,
     )
-    return totals
+
+
+@router.get("/", response_model=list[FoodLogEntry])
+async def get_entries(ctx: DayContext = Depends(get_day_context)):
+    entries = await ctx.entries()
+    return [entry_response(e) for e in entries]
+
+
+@router.get("/totals", response_model=DailyTotals)
+async def get_daily_totals(ctx: DayContext = Depends(get_day_context)):
+    summary = await ctx.summary()
+    return totals_response(summary)
 
 
 @router.get("/range", response_model=list[DailyTotals])
@@ -150,66 +127,28 @@ async def get_range_totals(
     user: User = Depends(get_current_user),
 ):
     """Get daily totals for a date range (for charts)."""
-    entries = await FoodLog.find(
-        FoodLog.user_id == str(user.id),
-        FoodLog.date >= start,
-        FoodLog.date <= end,
-    ).to_list()
-
-    # Group by date
-    daily: dict[DateType, list[FoodLog]] = {}
-    for e in entries:
-        daily.setdefault(e.date, []).append(e)
-
-    result = []
-    for d in sorted(daily.keys()):
-        day_entries = daily[d]
-        result.append(
-            DailyTotals(
-                date=d,
-                calories=sum(e.calories for e in day_entries),
-                protein_g=sum(e.protein_g for e in day_entries),
-                carbs_g=sum(e.carbs_g for e in day_entries),
-                fat_g=sum(e.fat_g for e in day_entries),
-                fiber_g=sum(e.fiber_g for e in day_entries),
-                sugar_g=sum(e.sugar_g for e in day_entries),
-                sodium_mg=sum(e.sodium_mg for e in day_entries),
-                saturated_fat_g=sum(e.saturated_fat_g for e in day_entries),
-                entry_count=len(day_entries),
-            )
-        )
-    return result
+    summaries = await get_range_summaries(str(user.id), start, end)
+    return [totals_response(s) for s in summaries]
 
 
 @router.get("/insights")
-async def get_insights(
-    target_date: DateType = Query(default_factory=DateType.today),
-    user: User = Depends(get_current_user),
-):
+async def get_insights(ctx: DayContext = Depends(get_day_context)):
     """Get rule-based daily insights comparing intake to targets."""
-    return await generate_daily_insights(str(user.id), target_date)
+    return await generate_daily_insights(ctx)
 
 
 @router.get("/alerts")
-async def get_alerts(
-    target_date: DateType = Query(default_factory=DateType.today),
-    user: User = Depends(get_current_user),
-):
+async def get_alerts(ctx: DayContext = Depends(get_day_context)):
     """Get nutrient alerts for the day based on intake limits."""
-    protein_target = user.targets.protein_g if user.targets else 0
-    alerts = await check_nutrient_alerts(
-        user_id=str(user.id),
-        target_date=target_date,
-        protein_target=protein_target,
-    )
-    return alerts
+    return await check_nutrient_alerts(ctx)
 
 
 class CopyMealRequest(BaseModel):
     source_date: DateType
-    source_meal: str
+    source_meal: str | None = None  # None = every meal on the day
     target_date: DateType
-    target_meal: str
+    target_meal: str | None = None  # None = keep each entry's meal
+    days: int = Field(1, ge=1, le=7)  # copy this many consecutive days
 
 
 class CopyMealResponse(BaseModel):
@@ -222,23 +161,26 @@ async def copy_meal(
     data: CopyMealRequest,
     user: User = Depends(get_current_user),
 ):
-    """Copy all food entries from one meal to another date/meal."""
+    """Copy food entries from one meal, day or week to another date/meal."""
     user_id = str(user.id)
-    source_entries = await FoodLog.find(
+    source_end = data.source_date + timedelta(days=data.days - 1)
+    query = FoodLog.find(
         FoodLog.user_id == user_id,
-        FoodLog.date == data.source_date,
-        FoodLog.meal == data.source_meal,
-    ).to_list()
+        FoodLog.date >= data.source_date,
+        FoodLog.date <= source_end,
+    )
+    if data.source_meal:
+        query = query.find(FoodLog.meal == data.source_meal)
+    source_entries = await query.sort("+date", "+meal", "+created_at").to_list()
 
     if not source_entries:
         raise HTTPException(status_code=404, detail="No entries found for that meal")
 
-    new_entries = []
-    for src in source_entries:
-        entry = FoodLog(
+    new_entries = [
+        FoodLog(
             user_id=user_id,
-            date=data.target_date,
-            meal=data.target_meal,
+            date=data.target_date + (src.date - data.source_date),
+            meal=data.target_meal or src.meal,
             food_id=src.food_id,
             food_name=src.food_name,
             serving_label=src.serving_label,
@@ -252,12 +194,14 @@ async def copy_meal(
             sodium_mg=src.sodium_mg,
             saturated_fat_g=src.saturated_fat_g,
         )
-        await entry.insert()
-        new_entries.append(entry)
+        for src in source_entries
+    ]
+    errors = await insert_entries(new_entries)
+    copied = [e for i, e in enumerate(new_entries) if i not in errors]
 
     return CopyMealResponse(
-        copied=len(new_entries),
-        entries=[_entry_response(e) for e in new_entries],
+        copied=len(copied),
+        entries=[entry_response(e) for e in copied],
     )
 
 
@@ -269,4 +213,4 @@ async def delete_entry(
     entry = await FoodLog.get(entry_id)
     if not entry or entry.user_id != str(user.id):
         raise HTTPException(status_code=404, detail="Entry not found")
-    await entry.delete()
+    await delete_entries([entry])
@@ -1,14 +1,28 @@
 import json
 import logging
+import re
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
+from pymongo.errors import DuplicateKeyError
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_optional_user
 from app.models.food import Food, Serving
-from app.models.food_log import FoodLog
 from app.models.user import User
 from app.redis import get_redis
+from app.services.food_affinity import rerank_for_user
+from app.services.food_cache import (
+    bump_catalog_version,
+    get_catalog_version,
+    record_cache_lookup,
+    search_cache_key,
+)
+from app.services.food_index import get_food_index, index_food
+from app.services.food_lookup import get_food as lookup_food
+from app.services.food_lookup import get_food_by_barcode, get_foods
+from app.services.food_search import decode_cursor, encode_cursor, text_search
+from app.services.food_stats import get_frequent_foods
+from app.utils.barcodes import normalize_barcode
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +46,7 @@ class FoodResponse(BaseModel):
     sugar_g: float
     sodium_mg: float
     saturated_fat_g: float
+    barcode: str | None = None
 
 
 def _food_response(food: Food) -> FoodResponse:
@@ -50,12 +65,15 @@ def _food_response(food: Food) -> FoodResponse:
         sugar_g=food.sugar_g,
         sodium_mg=food.sodium_mg,
         saturated_fat_g=food.saturated_fat_g,
+        barcode=food.barcode,
     )
 
 
 class FoodSearchResponse(BaseModel):
     results: list[FoodResponse]
     total: int
+    total_capped: bool = False  # total stopped counting at the cap
+    next_cursor: str | None = None  # pass as `cursor` for the next page
 
 
 @router.get("/search", response_model=FoodSearchResponse)
@@ -63,37 +81,108 @@ async def search_foods(
     q: str = Query(..., min_length=1),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    personalize: bool = Query(True, description="Boost foods the user logs often or favorited"),
+    user: User | None = Depends(get_optional_user),
 ):
-    cache_key = f"food:search:{q.lower().strip()}:{limit}:{offset}"
+    response = await _shared_search(q, limit, offset, cursor)
+    if user is not None and personalize:
+        # The shared page stays cacheable; only its order is per-user
+        response.results = await rerank_for_user(user, response.results, lambda r: r.id)
+    return response
+
+
+async def _shared_search(
+    q: str, limit: int, offset: int, cursor: str | None,
+) -> FoodSearchResponse:
+    """Search results in relevance order, identical for every user."""
+    index = await get_food_index()
+    if index is not None:
+        if cursor:
+            try:
+                offset = int(decode_cursor(cursor)["o"])
+            except (ValueError, KeyError, TypeError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+        foods, total = index.search(q, limit=limit, offset=offset)
+        has_more = offset + limit < total
+        return FoodSearchResponse(
+            results=[_food_response(f) for f in foods],
+            total=total,
+            next_cursor=encode_cursor({"o": offset + limit}) if has_more else None,
+        )
 
-    # Try Redis cache first
+    # Try Redis cache first (keys carry the catalog version, so writes invalidate them)
+    cache_key = None
     try:
         redis = get_redis()
+        cache_key = search_cache_key(await get_catalog_version(), q, limit, cursor or offset)
         cached = await redis.get(cache_key)
+        await record_cache_lookup("search", hit=bool(cached))
         if cached:
             return FoodSearchResponse(**json.loads(cached))
     except Exception:
         logger.debug("Redis cache miss or error for key %s", cache_key)
 
-    # Cache miss — query MongoDB
-    query = {"$text": {"$search": q}}
-    total = await Food.find(query).count()
-    foods = await Food.find(query).skip(offset).limit(limit).to_list()
+    # Cache miss — one $facet round trip for the page and the total
+    try:
+        page = await text_search(q, limit=limit, cursor=cursor, offset=offset)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     response = FoodSearchResponse(
-        results=[_food_response(f) for f in foods],
-        total=total,
+        results=[_food_response(f) for f in page.foods],
+        total=page.total,
+        total_capped=page.total_capped,
+        next_cursor=page.next_cursor,
     )
 
     # Store in Redis cache
-    try:
-        redis = get_redis()
-        await redis.set(cache_key, response.model_dump_json(), ex=FOOD_SEARCH_TTL)
-    except Exception:
-        logger.debug("Failed to cache food search results")
+    if cache_key:
+        try:
+            redis = get_redis()
+            await redis.set(cache_key, response.model_dump_json(), ex=FOOD_SEARCH_TTL)
+        except Exception:
+            logger.debug("Failed to cache food search results")
 
     return response
 
 
+class FoodSuggestion(BaseModel):
+    id: str
+    name: str
+    brand: str
+    serving_label: str
+    calories: float
+
+
+@router.get("/autocomplete", response_model=list[FoodSuggestion])
+async def autocomplete_foods(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(8, ge=1, le=20),
+    user: User | None = Depends(get_optional_user),
+):
+    """Suggest foods for a partially typed name ("chick" -> "Chicken breast")."""
+    index = await get_food_index()
+    if index is not None:
+        foods = index.autocomplete(q, limit=limit)
+    else:
+        # Without the index, match the start of the name (anchored, case-insensitive)
+        foods = await Food.find(
+            {"name": {"$regex": f"^{re.escape(q.strip())}", "$options": "i"}},
+        ).limit(limit).to_list()
+    if user is not None:
+        foods = await rerank_for_user(user, foods, lambda f: str(f.id))
+    return [
+        FoodSuggestion(
+            id=str(f.id),
+            name=f.name,
+            brand=f.brand,
+            serving_label=f.serving.label,
+            calories=f.calories,
+        )
+        for f in foods
+    ]
+
+
 class RecentFoodResponse(BaseModel):
     food_name: str
     food_id: str | None
@@ -115,50 +204,38 @@ async def get_recent_foods(
     user: User = Depends(get_current_user),
 ):
     """Get the user's most frequently logged foods."""
-    pipeline = [
-        {"$match": {"user_id": str(user.id)}},
-        {"$sort": {"created_at": -1}},
-        {"$group": {
-            "_id": "$food_name",
-            "food_id": {"$first": "$food_id"},
-            "count": {"$sum": 1},
-            "calories": {"$first": "$calories"},
-            "protein_g": {"$first": "$protein_g"},
-            "carbs_g": {"$first": "$carbs_g"},
-            "fat_g": {"$first": "$fat_g"},
-            "fiber_g": {"$first": "$fiber_g"},
-            "sugar_g": {"$first": "$sugar_g"},
-            "sodium_mg": {"$first": "$sodium_mg"},
-            "saturated_fat_g": {"$first": "$saturated_fat_g"},
-            "serving_label": {"$first": "$serving_label"},
-            "quantity": {"$first": "$quantity"},
-        }},
-        {"$sort": {"count": -1}},
-        {"$limit": limit},
-    ]
-    # Use motor collection directly — Beanie's .aggregate() wrapper
-    # incorrectly awaits the cursor creation in newer Motor versions
-    cursor = FoodLog.get_motor_collection().aggregate(pipeline)
-    results = await cursor.to_list(length=None)
+    stats = await get_frequent_foods(str(user.id), limit)
     return [
         RecentFoodResponse(
-            food_name=r["_id"],
-            food_id=r.get("food_id"),
-            count=r["count"],
-            calories=r["calories"],
-            protein_g=r["protein_g"],
-            carbs_g=r["carbs_g"],
-            fat_g=r["fat_g"],
-            fiber_g=r.get("fiber_g", 0),
-            sugar_g=r.get("sugar_g", 0),
-            sodium_mg=r.get("sodium_mg", 0),
-            saturated_fat_g=r.get("saturated_fat_g", 0),
-            serving_label=r["serving_label"],
+            food_name=stat.food_name,
+            food_id=stat.food_id,
+            count=stat.log_count,
+            calories=stat.calories,
+            protein_g=stat.protein_g,
+            carbs_g=stat.carbs_g,
+            fat_g=stat.fat_g,
+            fiber_g=stat.fiber_g,
+            sugar_g=stat.sugar_g,
+            sodium_mg=stat.sodium_mg,
+            saturated_fat_g=stat.saturated_fat_g,
+            serving_label=stat.serving_label,
         )
-        for r in results
+        for stat in stats
     ]
 
 
+@router.get("/barcode/{code}", response_model=FoodResponse)
+async def lookup_barcode(code: str):
+    """Look up a packaged food by its UPC/EAN barcode."""
+    barcode = normalize_barcode(code)
+    if not barcode:
+        raise HTTPException(status_code=400, detail="Invalid barcode")
+    food = await get_food_by_barcode(barcode)
+    if not food:
+        raise HTTPException(status_code=404, detail="No food with this barcode")
+    return _food_response(food)
+
+
 @router.get("/favorites", response_model=list[FoodResponse])
 async def get_favorite_foods(
     user: User = Depends(get_current_user),
@@ -166,8 +243,8 @@ async def get_favorite_foods(
     """Get the user's favorite foods."""
     if not user.favorite_foods:
         return []
-    foods = await Food.find({"_id": {"$in": [Food.id.parse(fid) for fid in user.favorite_foods]}}).to_list()
-    return [_food_response(f) for f in foods]
+    foods = await get_foods(user.favorite_foods)
+    return [_food_response(foods[fid]) for fid in user.favorite_foods if fid in foods]
 
 
 class FavoriteToggleResponse(BaseModel):
@@ -180,7 +257,7 @@ async def toggle_favorite_food(
     user: User = Depends(get_current_user),
 ):
     """Toggle a food as favorite."""
-    food = await Food.get(food_id)
+    food = await lookup_food(food_id)
     if not food:
         raise HTTPException(status_code=404, detail="Food not found")
 
@@ -195,9 +272,44 @@ async def toggle_favorite_food(
     return FavoriteToggleResponse(is_favorite=is_favorite)
 
 
+class SimilarFoodResponse(FoodResponse):
+    similarity: float
+
+
+@router.get("/{food_id}/similar", response_model=list[SimilarFoodResponse])
+async def get_similar_foods(
+    food_id: str,
+    limit: int = Query(10, ge=1, le=50),
+    more: list[str] = Query([]),
+    less: list[str] = Query([]),
+):
+    """Foods with the closest nutrient profile per 100 g, e.g. substitutes.
+
+    ``more`` / ``less`` (repeatable nutrient names such as ``protein_g``) keep
+    only foods with strictly more / less of that nutrient than this one.
+    """
+    index = await get_food_index()
+    if index is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Similar-food search needs the in-memory food index",
+        )
+    food = index.get(food_id)
+    if not food:
+        raise HTTPException(status_code=404, detail="Food not found")
+    try:
+        [neighbours] = index.similar([food], limit=limit, more=more, less=less)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return [
+        SimilarFoodResponse(**_food_response(f).model_dump(), similarity=round(score, 4))
+        for f, score in neighbours
+    ]
+
+
 @router.get("/{food_id}", response_model=FoodResponse)
 async def get_food(food_id: str):
-    food = await Food.get(food_id)
+    food = await lookup_food(food_id)
     if not food:
         raise HTTPException(status_code=404, detail="Food not found")
     return _food_response(food)
@@ -216,6 +328,7 @@ class CreateFoodRequest(BaseModel):
     sugar_g: float = 0
     sodium_mg: float = 0
     saturated_fat_g: float = 0
+    barcode: str | None = None
 
 
 @router.post("/", response_model=FoodResponse, status_code=201)
@@ -223,6 +336,12 @@ async def create_food(
     data: CreateFoodRequest,
     user: User = Depends(get_current_user),
 ):
+    barcode = None
+    if data.barcode:
+        barcode = normalize_barcode(data.barcode)
+        if not barcode:
+            raise HTTPException(status_code=400, detail="Invalid barcode")
+
     food = Food(
         name=data.name,
         brand=data.brand,
@@ -237,18 +356,15 @@ async def create_food(
         sugar_g=data.sugar_g,
         sodium_mg=data.sodium_mg,
         saturated_fat_g=data.saturated_fat_g,
+        barcode=barcode,
     )
-    await food.insert()
-
-    # Invalidate food search cache
     try:
-        redis = get_redis()
-        cursor = b"0"
-        while cursor:
-            cursor, keys = await redis.scan(cursor=cursor, match="food:search:*", count=100)
-            if keys:
-                await redis.delete(*keys)
-    except Exception:
-        logger.debug("Failed to invalidate food search cache")
+        await food.insert()
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A food with this barcode already exists",
+        )
+    index_food(food, await bump_catalog_version())
 
     return _food_response(food)
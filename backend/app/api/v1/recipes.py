@@ -4,10 +4,11 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
 from app.api.deps import get_current_user
-from app.models.food import Food
 from app.models.food_log import FoodLog
 from app.models.recipe import NutrientTotals, Recipe, RecipeIngredient
 from app.models.user import User
+from app.services.food_log_service import insert_entries
+from app.services.food_lookup import get_foods
 
 router = APIRouter(prefix="/recipes", tags=["recipes"])
 
@@ -102,9 +103,10 @@ def _recipe_response(recipe: Recipe) -> RecipeResponse:
 
 async def _build_ingredients(inputs: list[IngredientInput]) -> list[RecipeIngredient]:
     """Resolve food_ids to full ingredient data with calculated nutrients."""
+    foods = await get_foods([inp.food_id for inp in inputs])
     ingredients = []
     for inp in inputs:
-        food = await Food.get(inp.food_id)
+        food = foods.get(inp.food_id)
         if not food:
             raise HTTPException(status_code=400, detail=f"Food {inp.food_id} not found")
         qty = inp.quantity
@@ -247,7 +249,9 @@ async def log_recipe(
         sodium_mg=ps.sodium_mg * multiplier,
         saturated_fat_g=ps.saturated_fat_g * multiplier,
     )
-    await entry.insert()
+    errors = await insert_entries([entry])
+    if errors:
+        raise HTTPException(status_code=500, detail=errors[0])
 
     return {
         "id": str(entry.id),
@@ -1,15 +1,21 @@
-import csv
-import io
 from datetime import date as DateType, timedelta
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from app.api.deps import get_current_user
-from app.models.food_log import FoodLog
 from app.models.user import User
 from app.models.weight import Weight
+from app.services.daily_summary import NUTRIENT_KEYS
+from app.services.exports import (
+    COLUMNAR_FORMATS,
+    columnar_available,
+    columnar_chunks,
+    food_log_csv_chunks,
+    food_log_cursor,
+)
+from app.services.nutrition_aggregates import daily_totals
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
@@ -47,44 +53,25 @@ async def get_weekly_report(
     user_id = str(user.id)
     start_date = end_date - timedelta(days=6)
 
-    # Fetch all food logs for the week
-    entries = await FoodLog.find(
-        FoodLog.user_id == user_id,
-        FoodLog.date >= start_date,
-        FoodLog.date <= end_date,
-    ).to_list()
-
-    # Group by date
-    daily: dict[DateType, list[FoodLog]] = {}
-    for e in entries:
-        daily.setdefault(e.date, []).append(e)
-
-    nutrient_keys = ["calories", "protein_g", "carbs_g", "fat_g", "fiber_g", "sugar_g", "sodium_mg", "saturated_fat_g"]
+    # Per-day sums for the week, grouped in MongoDB
+    daily = {row["date"]: row for row in await daily_totals(user_id, start_date, end_date)}
 
     # Build daily breakdown
     daily_breakdown = []
     for d in range(7):
         day = start_date + timedelta(days=d)
-        day_entries = daily.get(day, [])
-        report = DayReport(
-            date=day,
-            calories=sum(e.calories for e in day_entries),
-            protein_g=sum(e.protein_g for e in day_entries),
-            carbs_g=sum(e.carbs_g for e in day_entries),
-            fat_g=sum(e.fat_g for e in day_entries),
-            fiber_g=sum(e.fiber_g for e in day_entries),
-            sugar_g=sum(e.sugar_g for e in day_entries),
-            sodium_mg=sum(e.sodium_mg for e in day_entries),
-            saturated_fat_g=sum(e.saturated_fat_g for e in day_entries),
-            entry_count=len(day_entries),
-        )
+        row = daily.get(day)
+        if row:
+            report = DayReport(**row)
+        else:
+            report = DayReport(date=day, entry_count=0, **{key: 0 for key in NUTRIENT_KEYS})
         daily_breakdown.append(report)
 
     # Calculate averages (only days with entries)
     logged_days = [d for d in daily_breakdown if d.entry_count > 0]
     n = len(logged_days) or 1
     averages = {}
-    for key in nutrient_keys:
+    for key in NUTRIENT_KEYS:
         averages[key] = round(sum(getattr(d, key) for d in logged_days) / n, 1)
 
     # Compare to targets
@@ -166,47 +153,31 @@ async def get_weekly_report(
 async def export_food_log(
     start: DateType = Query(...),
     end: DateType = Query(default_factory=DateType.today),
-    format: str = Query("csv"),
+    format: str = Query("csv", pattern="^(csv|parquet|arrow)$"),
     user: User = Depends(get_current_user),
 ):
-    """Export food log data as CSV."""
-    user_id = str(user.id)
-    entries = await FoodLog.find(
-        FoodLog.user_id == user_id,
-        FoodLog.date >= start,
-        FoodLog.date <= end,
-    ).sort("+date", "+meal", "+created_at").to_list()
-
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow([
-        "Date", "Meal", "Food", "Serving", "Quantity",
-        "Calories", "Protein (g)", "Carbs (g)", "Fat (g)",
-        "Fiber (g)", "Sugar (g)", "Sodium (mg)", "Saturated Fat (g)",
-    ])
-
-    for e in entries:
-        writer.writerow([
-            e.date.isoformat(),
-            e.meal,
-            e.food_name,
-            e.serving_label,
-            e.quantity,
-            round(e.calories, 1),
-            round(e.protein_g, 1),
-            round(e.carbs_g, 1),
-            round(e.fat_g, 1),
-            round(e.fiber_g, 1),
-            round(e.sugar_g, 1),
-            round(e.sodium_mg, 1),
-            round(e.saturated_fat_g, 1),
-        ])
-
-    output.seek(0)
-    filename = f"macroai_food_log_{start}_{end}.csv"
+    """Export food log data as CSV (or Parquet / Arrow IPC), streamed from the database cursor."""
+    if format in COLUMNAR_FORMATS and not columnar_available():
+        raise HTTPException(
+            status_code=400,
+            detail=f"{format} export is not available on this server",
+        )
+
+    cursor = food_log_cursor(str(user.id), start, end)
+    filename = f"macroai_food_log_{start}_{end}.{format}"
+
+    if format == "csv":
+        body = food_log_csv_chunks(cursor)
+        media_type = "text/csv"
+    else:
+        body = columnar_chunks(cursor, "food_logs", format)
+        media_type = (
+            "application/vnd.apache.parquet" if format == "parquet"
+            else "application/vnd.apache.arrow.stream"
+        )
 
     return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
+        body,
+        media_type=media_type,
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
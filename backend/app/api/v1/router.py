@@ -3,6 +3,7 @@ from fastapi import APIRouter
 from app.api.v1.auth import router as auth_router
 from app.api.v1.chat import router as chat_router
 from app.api.v1.checklist import router as checklist_router
+from app.api.v1.dashboard import router as dashboard_router
 from app.api.v1.food_log import router as food_log_router
 from app.api.v1.foods import router as foods_router
 from app.api.v1.recipes import router as recipes_router
@@ -24,3 +25,4 @@ v1_router.include_router(reminders_router)
 v1_router.include_router(checklist_router)
 v1_router.include_router(templates_router)
 v1_router.include_router(recipes_router)
+v1_router.include_router(dashboard_router)
@@ -1,17 +1,14 @@
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from app.api.deps import get_current_user
-from app.models.checklist import ChecklistItem
-from app.models.food_log import FoodLog
-from app.models.recipe import Recipe
-from app.models.reminder import Reminder
 from app.models.user import User
-from app.models.weight import Weight
 from app.schemas.user import AIConfigResponse, AIConfigUpdate, ProfileUpdate, TargetsUpdate, UserResponse
+from app.services.ai.llm import invalidate_chat_model
+from app.services.exports import account_json_chunks, account_ndjson_chunks, gzip_chunks
 from app.services.tdee_service import calculate_tdee, suggest_targets
 from app.utils.crypto import decrypt_api_key, encrypt_api_key
 
@@ -141,6 +138,7 @@ async def update_ai_config(
     data: AIConfigUpdate,
     user: User = Depends(get_current_user),
 ):
+    invalidate_chat_model(user.ai_config)
     user.ai_config.provider = data.provider
     user.ai_config.model = data.model
     if data.api_key:
@@ -157,87 +155,22 @@ async def update_ai_config(
 
 
 @router.get("/me/export")
-async def export_all_data(user: User = Depends(get_current_user)):
-    """Export all user data as JSON."""
-    user_id = str(user.id)
-
-    food_logs = await FoodLog.find(FoodLog.user_id == user_id).sort("+date").to_list()
-    weights = await Weight.find(Weight.user_id == user_id).sort("+date").to_list()
-    recipes = await Recipe.find(Recipe.user_id == user_id).to_list()
-    reminders = await Reminder.find(Reminder.user_id == user_id).to_list()
-    checklist = await ChecklistItem.find(ChecklistItem.user_id == user_id).to_list()
-
-    data = {
-        "exported_at": datetime.now(timezone.utc).isoformat(),
-        "profile": {
-            "email": user.email,
-            "display_name": user.profile.display_name,
-            "age": user.profile.age,
-            "height_cm": user.profile.height_cm,
-            "weight_kg": user.profile.weight_kg,
-            "gender": user.profile.gender,
-            "activity_level": user.profile.activity_level,
-        },
-        "targets": {
-            "calories": user.targets.calories,
-            "protein_g": user.targets.protein_g,
-            "carbs_g": user.targets.carbs_g,
-            "fat_g": user.targets.fat_g,
-            "fiber_g": user.targets.fiber_g,
-        },
-        "food_logs": [
-            {
-                "date": e.date.isoformat(),
-                "meal": e.meal,
-                "food_name": e.food_name,
-                "serving_label": e.serving_label,
-                "quantity": e.quantity,
-                "calories": e.calories,
-                "protein_g": e.protein_g,
-                "carbs_g": e.carbs_g,
-                "fat_g": e.fat_g,
-                "fiber_g": e.fiber_g,
-                "sugar_g": e.sugar_g,
-                "sodium_mg": e.sodium_mg,
-                "saturated_fat_g": e.saturated_fat_g,
-            }
-            for e in food_logs
-        ],
-        "weight_entries": [
-            {"date": w.date.isoformat(), "weight_kg": w.weight_kg, "note": getattr(w, "note", "")}
-            for w in weights
-        ],
-        "recipes": [
-            {
-                "name": r.name,
-                "description": r.description,
-                "servings": r.servings,
-                "ingredients": [
-                    {
-                        "food_name": i.food_name,
-                        "quantity": i.quantity,
-                        "calories": i.calories,
-                        "protein_g": i.protein_g,
-                        "carbs_g": i.carbs_g,
-                        "fat_g": i.fat_g,
-                    }
-                    for i in r.ingredients
-                ],
-                "per_serving": r.per_serving.model_dump(),
-            }
-            for r in recipes
-        ],
-        "reminders": [
-            {"type": r.type, "title": r.title, "time": r.time, "enabled": r.enabled}
-            for r in reminders
-        ],
-        "checklist": [
-            {"title": c.title, "type": c.type, "checked": c.checked, "date": c.date.isoformat()}
-            for c in checklist
-        ],
-    }
-
-    return JSONResponse(
-        content=data,
-        headers={"Content-Disposition": 'attachment; filename="macroai_export.json"'},
-    )
+async def export_all_data(
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    gzip: bool = Query(False),
+    user: User = Depends(get_current_user),
+):
+    """Export all user data as JSON (or NDJSON), streamed collection by collection."""
+    if format == "ndjson":
+        chunks = account_ndjson_chunks(user)
+        media_type = "application/x-ndjson"
+    else:
+        chunks = account_json_chunks(user)
+        media_type = "application/json"
+
+    headers = {"Content-Disposition": f'attachment; filename="macroai_export.{format}"'}
+    if gzip:
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
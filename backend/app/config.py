@@ -25,6 +25,16 @@ class Settings(BaseSettings):
     # Redis
     redis_url: str = "redis://localhost:6379"
 
+    # Food search: serve search/autocomplete from an in-memory index (MongoDB $text otherwise)
+    food_search_index: bool = True
+
+    # AI agent: how many read-only tool calls from one model message run at once
+    agent_tool_concurrency: int = 4
+    # AI agent context: recent turns always sent verbatim, and the estimated token
+    # budget per provider ("default" for the rest) before older turns are summarized
+    agent_context_turns: int = 6
+    agent_context_token_budgets: dict[str, int] = {"default": 16000, "local": 6000}
+
     # Auth
     jwt_algorithm: str = "HS256"
     jwt_access_expiry_minutes: int = 30
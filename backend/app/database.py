@@ -1,14 +1,16 @@
 from beanie import init_beanie
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 
 from app.config import settings
 from app.models.chat_session import ChatSession
-from app.models.checklist import ChecklistItem
+from app.models.checklist import ChecklistItem, ChecklistStreak
+from app.models.daily_summary import DailySummary
 from app.models.food import Food
 from app.models.food_log import FoodLog
 from app.models.recipe import Recipe
 from app.models.reminder import Reminder
 from app.models.user import User
+from app.models.user_food_stats import UserFoodStats
 from app.models.weight import Weight
 
 _client: AsyncIOMotorClient | None = None
@@ -17,12 +19,22 @@ _client: AsyncIOMotorClient | None = None
 async def init_database():
     global _client
     _client = AsyncIOMotorClient(settings.mongodb_url)
+    # init_beanie creates any missing indexes declared in each model's Settings
     await init_beanie(
         database=_client[settings.mongodb_database],
-        document_models=[User, Food, FoodLog, ChatSession, Weight, Reminder, ChecklistItem, Recipe],
+        document_models=[
+            User, Food, FoodLog, ChatSession, Weight, Reminder, ChecklistItem, Recipe,
+            DailySummary, ChecklistStreak, UserFoodStats,
+        ],
     )
 
 
+def get_database() -> AsyncIOMotorDatabase:
+    if _client is None:
+        raise RuntimeError("Database not initialized — call init_database()")
+    return _client[settings.mongodb_database]
+
+
 async def close_database():
     global _client
     if _client:
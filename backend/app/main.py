@@ -6,9 +6,11 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.router import v1_router
 from app.config import settings
-from app.database import close_database, init_database
+from app.database import close_database, get_database, init_database
 from app.redis import close_redis, get_redis, init_redis
 from app.services.ai.checkpointer import close_checkpointer, init_checkpointer
+from app.services.ai.graph import close_agent_graph, init_agent_graph
+from app.services.food_index import close_food_index, init_food_index
 
 logger = logging.getLogger(__name__)
 
@@ -35,11 +37,14 @@ async def ensure_single_user():
 async def lifespan(app: FastAPI):
     await init_database()
     await init_redis()
-    init_checkpointer(settings.mongodb_url, settings.mongodb_database)
+    await init_food_index()
+    init_agent_graph(await init_checkpointer(get_database()))
     if settings.single_user_mode:
         await ensure_single_user()
     yield
+    close_agent_graph()
     close_checkpointer()
+    close_food_index()
     await close_database()
     await close_redis()
 
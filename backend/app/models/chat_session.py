@@ -2,6 +2,7 @@ from datetime import datetime
 
 from beanie import Document
 from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 
 class ChatSession(Document):
@@ -12,3 +13,6 @@ class ChatSession(Document):
 
     class Settings:
         name = "chat_sessions"
+        indexes = [
+            IndexModel([("user_id", ASCENDING), ("updated_at", DESCENDING)]),
+        ]
@@ -2,6 +2,7 @@ from datetime import date as DateType, datetime
 
 from beanie import Document
 from pydantic import Field
+from pymongo import ASCENDING, IndexModel
 
 
 class ChecklistItem(Document):
@@ -19,3 +20,23 @@ class ChecklistItem(Document):
 
     class Settings:
         name = "checklist_items"
+        indexes = [
+            IndexModel([("user_id", ASCENDING), ("date", ASCENDING), ("created_at", ASCENDING)]),
+        ]
+
+
+class ChecklistStreak(Document):
+    """Cached checklist streak per user, kept current as checklist state changes."""
+
+    user_id: str
+    streak: int = 0  # consecutive qualifying days ending the day before `through_date`
+    through_date: DateType | None = None  # None = stale, recompute on next read
+    today_completion: float = 0  # completion for `through_date` itself
+
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "checklist_streaks"
+        indexes = [
+            IndexModel([("user_id", ASCENDING)], unique=True),
+        ]
@@ -0,0 +1,32 @@
+from datetime import date as DateType
+from datetime import datetime
+
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+
+class DailySummary(Document):
+    """Per-day nutrient rollup, maintained incrementally from food log writes."""
+
+    user_id: str
+    date: DateType
+
+    calories: float = 0
+    protein_g: float = 0
+    carbs_g: float = 0
+    fat_g: float = 0
+    fiber_g: float = 0
+    sugar_g: float = 0
+    sodium_mg: float = 0
+    saturated_fat_g: float = 0
+    entry_count: int = 0
+    meals: dict[str, int] = Field(default_factory=dict)  # entry count per meal
+
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "daily_summaries"
+        indexes = [
+            IndexModel([("user_id", ASCENDING), ("date", ASCENDING)], unique=True),
+        ]
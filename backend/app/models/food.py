@@ -2,7 +2,7 @@ from datetime import datetime
 
 from beanie import Document
 from pydantic import BaseModel, Field
-from pymongo import IndexModel, TEXT
+from pymongo import ASCENDING, IndexModel, TEXT
 
 
 class Serving(BaseModel):
@@ -16,6 +16,14 @@ class Food(Document):
     source: str = "custom"  # "usda", "custom"
     created_by: str | None = None  # user_id for custom foods
 
+    # Set by the bulk importer: stable id in the source dataset ("fdc:123456")
+    # and a hash of the imported fields, so unchanged rows are skipped on re-import
+    external_id: str | None = None
+    content_hash: str | None = None
+
+    # Normalized GTIN (see app.utils.barcodes) for packaged foods
+    barcode: str | None = None
+
     # Per serving
     serving: Serving = Field(default_factory=Serving)
     calories: float = 0
@@ -33,4 +41,15 @@ class Food(Document):
         name = "foods"
         indexes = [
             IndexModel([("name", TEXT)]),
+            # Partial rather than sparse: unset ids are stored as null
+            IndexModel(
+                [("external_id", ASCENDING)],
+                unique=True,
+                partialFilterExpression={"external_id": {"$type": "string"}},
+            ),
+            IndexModel(
+                [("barcode", ASCENDING)],
+                unique=True,
+                partialFilterExpression={"barcode": {"$type": "string"}},
+            ),
         ]
@@ -2,6 +2,7 @@ from datetime import date as DateType, datetime
 
 from beanie import Document
 from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 
 class FoodLog(Document):
@@ -28,3 +29,14 @@ class FoodLog(Document):
 
     class Settings:
         name = "food_logs"
+        indexes = [
+            # Day views, ranges and exports: user + date, ordered by meal then time
+            IndexModel([
+                ("user_id", ASCENDING),
+                ("date", ASCENDING),
+                ("meal", ASCENDING),
+                ("created_at", ASCENDING),
+            ]),
+            # Recent/frequent foods: newest first per user
+            IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)]),
+        ]
@@ -2,6 +2,7 @@ from datetime import datetime
 
 from beanie import Document
 from pydantic import BaseModel, Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 
 class RecipeIngredient(BaseModel):
@@ -44,3 +45,6 @@ class Recipe(Document):
 
     class Settings:
         name = "recipes"
+        indexes = [
+            IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)]),
+        ]
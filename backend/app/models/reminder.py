@@ -2,6 +2,7 @@ from datetime import datetime
 
 from beanie import Document
 from pydantic import Field
+from pymongo import ASCENDING, IndexModel
 
 
 class Reminder(Document):
@@ -18,3 +19,6 @@ class Reminder(Document):
 
     class Settings:
         name = "reminders"
+        indexes = [
+            IndexModel([("user_id", ASCENDING), ("time", ASCENDING)]),
+        ]
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+
+class UserFoodStats(Document):
+    """How often a user logs a food, with a snapshot of the latest entry for re-logging."""
+
+    user_id: str
+    food_name: str
+    log_count: int = 0
+    last_logged_at: datetime = Field(default_factory=datetime.utcnow)
+
+    # Snapshot of the most recently logged entry
+    food_id: str | None = None
+    serving_label: str = "1 serving"
+    quantity: float = 1.0
+    calories: float = 0
+    protein_g: float = 0
+    carbs_g: float = 0
+    fat_g: float = 0
+    fiber_g: float = 0
+    sugar_g: float = 0
+    sodium_mg: float = 0
+    saturated_fat_g: float = 0
+
+    class Settings:
+        name = "user_food_stats"
+        indexes = [
+            IndexModel([("user_id", ASCENDING), ("food_name", ASCENDING)], unique=True),
+            # Search re-ranking: affinity for the foods on a results page
+            IndexModel([("user_id", ASCENDING), ("food_id", ASCENDING)]),
+            # Bounded "most frequent" read
+            IndexModel([
+                ("user_id", ASCENDING),
+                ("log_count", DESCENDING),
+                ("last_logged_at", DESCENDING),
+            ]),
+        ]
@@ -2,6 +2,7 @@ from datetime import date as DateType, datetime
 
 from beanie import Document
 from pydantic import Field
+from pymongo import ASCENDING, IndexModel
 
 
 class Weight(Document):
@@ -14,3 +15,6 @@ class Weight(Document):
 
     class Settings:
         name = "weights"
+        indexes = [
+            IndexModel([("user_id", ASCENDING), ("date", ASCENDING)]),
+        ]
@@ -0,0 +1,27 @@
+from datetime import date as DateType
+
+from pydantic import BaseModel
+
+from app.models.checklist import ChecklistItem
+
+
+class ChecklistItemResponse(BaseModel):
+    id: str
+    date: DateType
+    title: str
+    type: str
+    checked: bool
+    auto_check_field: str
+    auto_check_target: float
+
+
+def item_response(item: ChecklistItem) -> ChecklistItemResponse:
+    return ChecklistItemResponse(
+        id=str(item.id),
+        date=item.date,
+        title=item.title,
+        type=item.type,
+        checked=item.checked,
+        auto_check_field=item.auto_check_field,
+        auto_check_target=item.auto_check_target,
+    )
@@ -0,0 +1,72 @@
+from datetime import date as DateType
+
+from pydantic import BaseModel
+
+from app.models.daily_summary import DailySummary
+from app.models.food_log import FoodLog
+
+
+class FoodLogEntry(BaseModel):
+    id: str
+    date: DateType
+    meal: str
+    food_id: str | None
+    food_name: str
+    serving_label: str
+    quantity: float
+    calories: float
+    protein_g: float
+    carbs_g: float
+    fat_g: float
+    fiber_g: float
+    sugar_g: float
+    sodium_mg: float
+    saturated_fat_g: float
+
+
+class DailyTotals(BaseModel):
+    date: DateType
+    calories: float
+    protein_g: float
+    carbs_g: float
+    fat_g: float
+    fiber_g: float
+    sugar_g: float
+    sodium_mg: float
+    saturated_fat_g: float
+    entry_count: int
+
+
+def entry_response(entry: FoodLog) -> FoodLogEntry:
+    return FoodLogEntry(
+        id=str(entry.id),
+        date=entry.date,
+        meal=entry.meal,
+        food_id=entry.food_id,
+        food_name=entry.food_name,
+        serving_label=entry.serving_label,
+        quantity=entry.quantity,
+        calories=entry.calories,
+        protein_g=entry.protein_g,
+        carbs_g=entry.carbs_g,
+        fat_g=entry.fat_g,
+        fiber_g=entry.fiber_g,
+        sugar_g=entry.sugar_g,
+        sodium_mg=entry.sodium_mg,
+        saturated_fat_g=entry.saturated_fat_g,
+    )
+
+
+def totals_response(summary: DailySummary) -> DailyTotals:
+    return DailyTotals(
+        date=summary.date,
+        calories=summary.calories,
+        protein_g=summary.protein_g,
+        carbs_g=summary.carbs_g,
+        fat_g=summary.fat_g,
+        fiber_g=summary.fiber_g,
+        sugar_g=summary.sugar_g,
+        sodium_mg=summary.sodium_mg,
+        saturated_fat_g=summary.saturated_fat_g,
+        entry_count=summary.entry_count,
+    )
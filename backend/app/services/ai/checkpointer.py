@@ -1,30 +1,197 @@
-from langgraph.checkpoint.mongodb import MongoDBSaver
-from pymongo import MongoClient
+"""LangGraph checkpoint saver on the app's Motor client.
 
-_checkpointer: MongoDBSaver | None = None
-_sync_client: MongoClient | None = None
+``langgraph-checkpoint-mongodb``'s ``MongoDBSaver`` drives a synchronous
+``pymongo`` client and implements the async API by running each call in the
+default executor, so every graph step of every chat competes for those threads
+with the rest of the app. ``AsyncMongoDBSaver`` keeps the same collections and
+document layout (existing chat history stays readable) but awaits Motor
+directly, sharing the connection pool Beanie already uses.
 
+The graph only runs through the async API (``astream``); the sync methods are
+not implemented.
+"""
 
-def init_checkpointer(mongodb_url: str, db_name: str = "macroai") -> MongoDBSaver:
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+)
+from langgraph.checkpoint.mongodb.utils import dumps_metadata, loads_metadata
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+CHECKPOINT_COLLECTION = "checkpoints"
+WRITES_COLLECTION = "checkpoint_writes"
+
+
+class AsyncMongoDBSaver(BaseCheckpointSaver):
+    def __init__(self, db: AsyncIOMotorDatabase):
+        super().__init__()
+        self.checkpoint_collection = db[CHECKPOINT_COLLECTION]
+        self.writes_collection = db[WRITES_COLLECTION]
+
+    async def setup(self):
+        """Create the indexes MongoDBSaver would (no-op if they exist)."""
+        await self.checkpoint_collection.create_index(
+            [("thread_id", 1), ("checkpoint_ns", 1), ("checkpoint_id", -1)], unique=True,
+        )
+        await self.writes_collection.create_index(
+            [
+                ("thread_id", 1),
+                ("checkpoint_ns", 1),
+                ("checkpoint_id", -1),
+                ("task_id", 1),
+                ("idx", 1),
+            ],
+            unique=True,
+        )
+
+    async def _tuple(self, doc: dict) -> CheckpointTuple:
+        config_values = {
+            "thread_id": doc["thread_id"],
+            "checkpoint_ns": doc["checkpoint_ns"],
+            "checkpoint_id": doc["checkpoint_id"],
+        }
+        pending_writes = [
+            (w["task_id"], w["channel"], self.serde.loads_typed((w["type"], w["value"])))
+            async for w in self.writes_collection.find(config_values)
+        ]
+        parent_config = None
+        if doc.get("parent_checkpoint_id"):
+            parent_config = {"configurable": {
+                **config_values, "checkpoint_id": doc["parent_checkpoint_id"],
+            }}
+        return CheckpointTuple(
+            config={"configurable": config_values},
+            checkpoint=self.serde.loads_typed((doc["type"], doc["checkpoint"])),
+            metadata=loads_metadata(self.serde, doc["metadata"]),
+            parent_config=parent_config,
+            pending_writes=pending_writes,
+        )
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """The requested checkpoint, or the thread's latest without a checkpoint_id."""
+        query = {
+            "thread_id": config["configurable"]["thread_id"],
+            "checkpoint_ns": config["configurable"].get("checkpoint_ns", ""),
+        }
+        if checkpoint_id := get_checkpoint_id(config):
+            query["checkpoint_id"] = checkpoint_id
+        doc = await self.checkpoint_collection.find_one(query, sort=[("checkpoint_id", -1)])
+        return await self._tuple(doc) if doc else None
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        query: dict[str, Any] = {}
+        if config is not None:
+            for key in ("thread_id", "checkpoint_ns"):
+                if key in config["configurable"]:
+                    query[key] = config["configurable"][key]
+        for key, value in (filter or {}).items():
+            query[f"metadata.{key}"] = dumps_metadata(self.serde, value)
+        if before is not None:
+            query["checkpoint_id"] = {"$lt": before["configurable"]["checkpoint_id"]}
+
+        cursor = self.checkpoint_collection.find(
+            query, sort=[("checkpoint_id", -1)], limit=limit or 0,
+        )
+        async for doc in cursor:
+            yield await self._tuple(doc)
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        configurable = config["configurable"]
+        type_, serialized = self.serde.dumps_typed(checkpoint)
+        metadata = {**metadata, **config.get("metadata", {})}
+        key = {
+            "thread_id": configurable["thread_id"],
+            "checkpoint_ns": configurable["checkpoint_ns"],
+            "checkpoint_id": checkpoint["id"],
+        }
+        await self.checkpoint_collection.update_one(
+            key,
+            {"$set": {
+                "parent_checkpoint_id": configurable.get("checkpoint_id"),
+                "type": type_,
+                "checkpoint": serialized,
+                "metadata": dumps_metadata(self.serde, metadata),
+            }},
+            upsert=True,
+        )
+        return {"configurable": key}
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ):
+        if not writes:
+            return
+        configurable = config["configurable"]
+        # Existing writes are only replaced when they are all special (error) writes
+        replace = all(channel in WRITES_IDX_MAP for channel, _ in writes)
+        method = "$set" if replace else "$setOnInsert"
+        ops = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, serialized = self.serde.dumps_typed(value)
+            ops.append(UpdateOne(
+                {
+                    "thread_id": configurable["thread_id"],
+                    "checkpoint_ns": configurable["checkpoint_ns"],
+                    "checkpoint_id": configurable["checkpoint_id"],
+                    "task_id": task_id,
+                    "task_path": task_path,
+                    "idx": WRITES_IDX_MAP.get(channel, idx),
+                },
+                {method: {"channel": channel, "type": type_, "value": serialized}},
+                upsert=True,
+            ))
+        await self.writes_collection.bulk_write(ops)
+
+    async def adelete_thread(self, thread_id: str):
+        await self.checkpoint_collection.delete_many({"thread_id": thread_id})
+        await self.writes_collection.delete_many({"thread_id": thread_id})
+
+
+_checkpointer: AsyncMongoDBSaver | None = None
+
+
+async def init_checkpointer(db: AsyncIOMotorDatabase) -> AsyncMongoDBSaver:
     """Initialize the MongoDB checkpointer. Call once at app startup."""
-    global _checkpointer, _sync_client
-    _sync_client = MongoClient(mongodb_url)
-    _checkpointer = MongoDBSaver(
-        client=_sync_client,
-        db_name=db_name,
-    )
+    global _checkpointer
+    _checkpointer = AsyncMongoDBSaver(db)
+    await _checkpointer.setup()
     return _checkpointer
 
 
-def get_checkpointer() -> MongoDBSaver:
+def get_checkpointer() -> AsyncMongoDBSaver:
     if _checkpointer is None:
         raise RuntimeError("Checkpointer not initialized — call init_checkpointer()")
     return _checkpointer
 
 
 def close_checkpointer():
-    global _checkpointer, _sync_client
-    if _sync_client:
-        _sync_client.close()
-        _sync_client = None
+    # The Motor client belongs to app.database and is closed there
+    global _checkpointer
     _checkpointer = None
@@ -0,0 +1,138 @@
+"""Keeps the agent's context bounded as a chat session grows.
+
+Runs before every agent step. The last ``agent_context_turns`` turns (a turn
+starts at each user message) are always sent verbatim. Tool outputs in older
+turns are cut down to ``TOOL_OUTPUT_CHARS``, since the model has already
+answered from them. If the conversation still exceeds the token budget for the
+user's provider, the older turns are folded into a rolling summary kept in the
+graph state and removed from it, so checkpoints stop growing too.
+
+Token counts are estimated at ``CHARS_PER_TOKEN`` characters per token; that
+is close enough to keep well clear of provider limits without a tokenizer.
+"""
+
+import json
+import logging
+
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    RemoveMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langchain_core.runnables import RunnableConfig
+
+from app.config import settings
+from app.services.ai.llm import get_chat_model
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+# Per-message overhead (role, separators) in the token estimate
+MESSAGE_TOKENS = 4
+# Old tool outputs are truncated to this many characters
+TOOL_OUTPUT_CHARS = 300
+
+SUMMARY_PROMPT = """You maintain a running summary of a conversation between a user and \
+MacroAI, a nutrition assistant. Update the summary with the new messages below.
+Keep facts that matter later: the user's goals, preferences, allergies, foods logged or \
+discussed, targets changed, and open questions. Drop small talk and raw tool data. \
+Write at most 200 words in plain prose."""
+
+
+def estimate_tokens(messages: list[BaseMessage], summary: str = "") -> int:
+    chars = len(summary)
+    for m in messages:
+        chars += len(m.content) if isinstance(m.content, str) else len(json.dumps(m.content))
+        if isinstance(m, AIMessage) and m.tool_calls:
+            chars += len(json.dumps([call["args"] for call in m.tool_calls]))
+    return chars // CHARS_PER_TOKEN + MESSAGE_TOKENS * len(messages)
+
+
+def token_budget(provider: str) -> int:
+    budgets = settings.agent_context_token_budgets
+    return budgets.get(provider, budgets.get("default", 16000))
+
+
+def split_turns(messages: list[BaseMessage]) -> list[list[BaseMessage]]:
+    """Group messages into turns, each starting at a user message."""
+    turns: list[list[BaseMessage]] = []
+    for m in messages:
+        if isinstance(m, HumanMessage) or not turns:
+            turns.append([])
+        turns[-1].append(m)
+    return turns
+
+
+def _compact(message: ToolMessage) -> ToolMessage:
+    # Same id, so add_messages replaces the stored message
+    content = message.content if isinstance(message.content, str) else json.dumps(message.content)
+    return ToolMessage(
+        id=message.id,
+        content=content[:TOOL_OUTPUT_CHARS] + " …[truncated]",
+        name=message.name,
+        tool_call_id=message.tool_call_id,
+    )
+
+
+def _transcript(messages: list[BaseMessage]) -> str:
+    lines = []
+    for m in messages:
+        if isinstance(m, HumanMessage):
+            lines.append(f"User: {m.content}")
+        elif isinstance(m, ToolMessage):
+            lines.append(f"Tool {m.name}: {str(m.content)[:TOOL_OUTPUT_CHARS]}")
+        elif isinstance(m, AIMessage):
+            if m.content:
+                lines.append(f"Assistant: {m.content}")
+            for call in m.tool_calls:
+                lines.append(f"Assistant called {call['name']}({json.dumps(call['args'])})")
+    return "\n".join(lines)
+
+
+async def summarize(user, summary: str, messages: list[BaseMessage]) -> str:
+    """Fold ``messages`` into the running ``summary``."""
+    model = get_chat_model(user)
+    prompt = f"Current summary:\n{summary or '(none)'}\n\nNew messages:\n{_transcript(messages)}"
+    # The graph's config (and its message-stream callback) reaches this call through
+    # contextvars; replace the callbacks so summary tokens never reach the chat stream
+    response = await model.ainvoke(
+        [SystemMessage(content=SUMMARY_PROMPT), HumanMessage(prompt)],
+        config={"callbacks": []},
+    )
+    return str(response.content).strip()
+
+
+async def context_node(state: dict, config: RunnableConfig):
+    """Compact old tool outputs and summarize old turns once over the token budget."""
+    user = config["configurable"]["user"]
+    messages = list(state["messages"])
+    summary = state.get("summary") or ""
+
+    turns = split_turns(messages)
+    keep = max(settings.agent_context_turns, 1)
+    old = [m for turn in turns[:-keep] for m in turn]
+    if not old:
+        return {}
+
+    compacted = {
+        m.id: _compact(m)
+        for m in old
+        if isinstance(m, ToolMessage) and len(str(m.content)) > TOOL_OUTPUT_CHARS + 20
+    }
+    current = [compacted.get(m.id, m) for m in messages]
+    if estimate_tokens(current, summary) <= token_budget(user.ai_config.provider):
+        return {"messages": list(compacted.values())} if compacted else {}
+
+    try:
+        summary = await summarize(user, summary, old)
+    except Exception as e:
+        # Keep the history rather than lose it; the next step tries again
+        logger.warning("Failed to summarize chat history: %s", e)
+        return {"messages": list(compacted.values())} if compacted else {}
+    return {
+        "messages": [RemoveMessage(id=m.id) for m in old],
+        "summary": summary,
+    }
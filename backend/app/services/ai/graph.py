@@ -1,16 +1,21 @@
+import asyncio
 import json
 import logging
 from typing import Annotated, Sequence, TypedDict
 
 from langchain_core.messages import BaseMessage, SystemMessage, ToolMessage
 from langchain_core.runnables import RunnableConfig
-from langgraph.checkpoint.mongodb import MongoDBSaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, StateGraph
 from langgraph.graph.message import add_messages
+from langgraph.graph.state import CompiledStateGraph
 
-from app.services.ai.llm import build_chat_model
+from app.config import settings
+from app.services.ai.context import context_node
+from app.services.ai.llm import get_chat_model
 from app.services.ai.prompts import SYSTEM_PROMPT
 from app.services.ai.tools import (
+    find_similar_foods,
     get_daily_totals,
     get_nutrient_alerts,
     get_todays_food_log,
@@ -36,6 +41,8 @@ MAX_TOOL_CALLS_PER_TURN = 20
 class AgentState(TypedDict):
     messages: Annotated[Sequence[BaseMessage], add_messages]
     user_id: str
+    # Rolling summary of turns the context stage has removed from messages
+    summary: str
 
 
 # ── Tools registry ───────────────────────────────────────
@@ -49,6 +56,7 @@ ALL_TOOLS = [
     get_weight_trend,
     get_nutrient_alerts,
     search_food_database,
+    find_similar_foods,
     log_food,
     quick_log,
     suggest_meals,
@@ -57,6 +65,9 @@ ALL_TOOLS = [
 
 tools_by_name = {t.name: t for t in ALL_TOOLS}
 
+# Tools that change the user's data; these never run concurrently with other calls
+WRITE_TOOLS = {log_food.name, quick_log.name, update_daily_targets.name}
+
 
 # ── Nodes ────────────────────────────────────────────────
 
@@ -64,40 +75,66 @@ tools_by_name = {t.name: t for t in ALL_TOOLS}
 async def agent_node(state: AgentState, config: RunnableConfig):
     """Call the LLM with the current messages and bound tools."""
     user = config["configurable"]["user"]
-    model = build_chat_model(user).bind_tools(ALL_TOOLS)
+    model = get_chat_model(user, ALL_TOOLS)
 
-    system = SystemMessage(content=SYSTEM_PROMPT)
-    response = await model.ainvoke([system] + list(state["messages"]), config)
+    system = [SystemMessage(content=SYSTEM_PROMPT)]
+    if state.get("summary"):
+        summary = f"Summary of the earlier conversation:\n{state['summary']}"
+        system.append(SystemMessage(content=summary))
+    response = await model.ainvoke(system + list(state["messages"]), config)
     return {"messages": [response]}
 
 
+async def _call_tool(tool_call: dict, user_id: str) -> ToolMessage:
+    name = tool_call["name"]
+    args = tool_call["args"].copy()
+
+    tool = tools_by_name.get(name)
+    if tool is None:
+        return ToolMessage(content=f"Unknown tool {name}", name=name, tool_call_id=tool_call["id"])
+
+    # Inject user_id into tools that need it (LLM never sees this param)
+    if "user_id" in tool.args:
+        args["user_id"] = user_id
+
+    try:
+        result = await tool.ainvoke(args)
+    except Exception as e:
+        logger.error("Tool %s failed: %s", name, e)
+        result = f"Error calling {name}: {e}"
+
+    return ToolMessage(
+        content=json.dumps(result) if not isinstance(result, str) else result,
+        name=name,
+        tool_call_id=tool_call["id"],
+    )
+
+
 async def tool_node(state: AgentState):
-    """Execute tool calls from the last LLM message."""
-    outputs = []
-    last_message = state["messages"][-1]
-    user_id = state["user_id"]
+    """Execute tool calls from the last LLM message.
 
-    for tool_call in last_message.tool_calls:
-        name = tool_call["name"]
-        args = tool_call["args"].copy()
-
-        # Inject user_id into tools that need it (LLM never sees this param)
-        if "user_id" in tools_by_name[name].args:
-            args["user_id"] = user_id
-
-        try:
-            result = await tools_by_name[name].ainvoke(args)
-        except Exception as e:
-            logger.error("Tool %s failed: %s", name, e)
-            result = f"Error calling {name}: {e}"
-
-        outputs.append(
-            ToolMessage(
-                content=json.dumps(result) if not isinstance(result, str) else result,
-                name=name,
-                tool_call_id=tool_call["id"],
-            )
-        )
+    Read-only calls run concurrently (up to ``agent_tool_concurrency`` at a
+    time). A write tool waits for the calls before it, runs alone, and only
+    then are later calls started, so reads after a write see its effect.
+    Results keep the order of the tool calls.
+    """
+    user_id = state["user_id"]
+    slots = asyncio.Semaphore(max(settings.agent_tool_concurrency, 1))
+
+    async def call_read(tool_call: dict) -> ToolMessage:
+        async with slots:
+            return await _call_tool(tool_call, user_id)
+
+    outputs: list[ToolMessage] = []
+    reads: list[dict] = []
+    for tool_call in state["messages"][-1].tool_calls:
+        if tool_call["name"] in WRITE_TOOLS:
+            outputs.extend(await asyncio.gather(*map(call_read, reads)))
+            reads = []
+            outputs.append(await _call_tool(tool_call, user_id))
+        else:
+            reads.append(tool_call)
+    outputs.extend(await asyncio.gather(*map(call_read, reads)))
     return {"messages": outputs}
 
 
@@ -120,19 +157,47 @@ def should_continue(state: AgentState) -> str:
 # ── Graph Construction ───────────────────────────────────
 
 
-def build_agent_graph(checkpointer: MongoDBSaver):
-    """Build and compile the MacroAI ReAct agent graph."""
+def build_agent_graph(checkpointer: BaseCheckpointSaver):
+    """Build and compile the MacroAI ReAct agent graph.
+
+    The graph holds no per-user state (the user arrives in
+    ``config["configurable"]``), so the app compiles it once at startup —
+    use ``get_agent_graph`` rather than calling this per connection.
+    """
     workflow = StateGraph(AgentState)
 
+    workflow.add_node("context", context_node)
     workflow.add_node("agent", agent_node)
     workflow.add_node("tools", tool_node)
 
-    workflow.set_entry_point("agent")
+    workflow.set_entry_point("context")
+    workflow.add_edge("context", "agent")
     workflow.add_conditional_edges(
         "agent",
         should_continue,
         {"tools": "tools", "end": END},
     )
-    workflow.add_edge("tools", "agent")
+    workflow.add_edge("tools", "context")
 
     return workflow.compile(checkpointer=checkpointer)
+
+
+_graph: CompiledStateGraph | None = None
+
+
+def init_agent_graph(checkpointer: BaseCheckpointSaver) -> CompiledStateGraph:
+    """Compile the shared agent graph. Call once at app startup."""
+    global _graph
+    _graph = build_agent_graph(checkpointer)
+    return _graph
+
+
+def get_agent_graph() -> CompiledStateGraph:
+    if _graph is None:
+        raise RuntimeError("Agent graph not initialized — call init_agent_graph()")
+    return _graph
+
+
+def close_agent_graph():
+    global _graph
+    _graph = None
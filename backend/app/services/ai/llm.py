@@ -1,7 +1,15 @@
+import hashlib
+from collections.abc import Sequence
+
 from langchain_community.chat_models import ChatLiteLLM
+from langchain_core.language_models import LanguageModelInput
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import Runnable
+from langchain_core.tools import BaseTool
 
-from app.models.user import User
+from app.models.user import AIConfig, User
 from app.utils.crypto import decrypt_api_key
+from app.utils.lru import MISSING, TTLCache
 
 PROVIDER_PREFIXES = {
     "claude": "anthropic/",
@@ -18,6 +26,13 @@ PROVIDER_PREFIXES = {
 # (zai/ prefix handles ZhipuAI base URL automatically)
 PROVIDER_BASE_URLS: dict[str, str] = {}
 
+# Bound chat models per distinct AI config. Entries expire so a worker doesn't
+# hold clients for configs nobody uses any more.
+CHAT_MODEL_CACHE_SIZE = 256
+CHAT_MODEL_CACHE_TTL = 3600
+
+_chat_models = TTLCache(CHAT_MODEL_CACHE_SIZE, CHAT_MODEL_CACHE_TTL)
+
 
 def build_chat_model(user: User) -> ChatLiteLLM:
     """Create a ChatLiteLLM instance from the user's AI config."""
@@ -38,3 +53,41 @@ def build_chat_model(user: User) -> ChatLiteLLM:
         temperature=0.7,
         streaming=True,
     )
+
+
+def _config_key(config: AIConfig) -> str:
+    # The stored key is encrypted with a fresh nonce on every save, so hashing
+    # the ciphertext fingerprints it without decrypting
+    fingerprint = hashlib.sha256(config.api_key.encode()).hexdigest()
+    parts = [config.provider, config.model, config.base_url, fingerprint]
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+def get_chat_model(
+    user: User, tools: Sequence[BaseTool] = (),
+) -> Runnable[LanguageModelInput, BaseMessage]:
+    """The user's chat model with ``tools`` bound, shared by every user with the same config.
+
+    Reusing the instance skips decrypting the key and serializing the tool
+    schemas on every agent step, and lets LiteLLM reuse its HTTP client for
+    the provider. Call ``invalidate_chat_model`` before the config changes.
+    """
+    key = _config_key(user.ai_config)
+    # One entry per config, holding the model bound to each tool set it was asked for
+    variants = _chat_models.get(key)
+    if variants is MISSING:
+        variants = {}
+        _chat_models.set(key, variants)
+    tool_names = tuple(t.name for t in tools)
+    model = variants.get(tool_names)
+    if model is None:
+        model = build_chat_model(user)
+        if tools:
+            model = model.bind_tools(tools)
+        variants[tool_names] = model
+    return model
+
+
+def invalidate_chat_model(config: AIConfig):
+    """Drop the cached models for a config that is about to be replaced."""
+    _chat_models.pop(_config_key(config))
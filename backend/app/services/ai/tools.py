@@ -6,7 +6,20 @@ from app.models.food import Food
 from app.models.food_log import FoodLog
 from app.models.user import User
 from app.models.weight import Weight
+from app.services.daily_summary import get_daily_summary
+from app.services.day_context import DayContext
+from app.services.food_affinity import rerank_for_user
+from app.services.food_index import find_foods, get_food_index, match_foods
+from app.services.food_log_service import insert_entries
 from app.services.nutrient_alerts import check_nutrient_alerts
+from app.services.nutrition_aggregates import average_totals, daily_totals
+
+# quick_log only logs its best fuzzy match above this score; below it, it asks
+QUICK_LOG_MIN_SCORE = 0.75
+# find_similar_foods compares at most this many foods per call
+MAX_SIMILAR_FOODS = 10
+# find_similar_foods only uses a named food whose best match scores at least this
+SIMILAR_FOODS_MIN_SCORE = 0.75
 
 
 # ── Read Tools ──────────────────────────────────────────────
@@ -51,23 +64,14 @@ async def get_todays_food_log(user_id: str) -> str:
 async def get_daily_totals(user_id: str, date_str: str = "") -> str:
     """Get total calories and macros for a given date (YYYY-MM-DD). Defaults to today."""
     target_date = date.fromisoformat(date_str) if date_str else date.today()
-    entries = await FoodLog.find(
-        FoodLog.user_id == user_id,
-        FoodLog.date == target_date,
-    ).to_list()
-
-    keys = ["calories", "protein_g", "carbs_g", "fat_g", "fiber_g", "sugar_g", "sodium_mg", "saturated_fat_g"]
-    totals = {k: 0.0 for k in keys}
-    for e in entries:
-        for k in keys:
-            totals[k] += getattr(e, k)
+    totals = await get_daily_summary(user_id, target_date)
 
     return (
-        f"Totals for {target_date}: {totals['calories']:.0f} kcal, "
-        f"{totals['protein_g']:.0f}g protein, {totals['carbs_g']:.0f}g carbs, "
-        f"{totals['fat_g']:.0f}g fat, {totals['fiber_g']:.0f}g fiber, "
-        f"{totals['sugar_g']:.0f}g sugar, {totals['sodium_mg']:.0f}mg sodium, "
-        f"{totals['saturated_fat_g']:.0f}g saturated fat"
+        f"Totals for {target_date}: {totals.calories:.0f} kcal, "
+        f"{totals.protein_g:.0f}g protein, {totals.carbs_g:.0f}g carbs, "
+        f"{totals.fat_g:.0f}g fat, {totals.fiber_g:.0f}g fiber, "
+        f"{totals.sugar_g:.0f}g sugar, {totals.sodium_mg:.0f}mg sodium, "
+        f"{totals.saturated_fat_g:.0f}g saturated fat"
     )
 
 
@@ -76,28 +80,17 @@ async def get_weekly_averages(user_id: str) -> str:
     """Get average daily calories and macros over the past 7 days."""
     today = date.today()
     week_ago = today - timedelta(days=7)
-    entries = await FoodLog.find(
-        FoodLog.user_id == user_id,
-        FoodLog.date >= week_ago,
-        FoodLog.date <= today,
-    ).to_list()
+    days = await daily_totals(user_id, week_ago, today)
 
-    if not entries:
+    if not days:
         return "No data for the past 7 days."
 
-    daily: dict[date, dict] = {}
-    for e in entries:
-        d = daily.setdefault(e.date, {"cal": 0, "p": 0, "c": 0, "f": 0})
-        d["cal"] += e.calories
-        d["p"] += e.protein_g
-        d["c"] += e.carbs_g
-        d["f"] += e.fat_g
-
-    n = len(daily)
-    avg_cal = sum(d["cal"] for d in daily.values()) / n
-    avg_p = sum(d["p"] for d in daily.values()) / n
-    avg_c = sum(d["c"] for d in daily.values()) / n
-    avg_f = sum(d["f"] for d in daily.values()) / n
+    n = len(days)
+    avgs = average_totals(days)
+    avg_cal = avgs["calories"]
+    avg_p = avgs["protein_g"]
+    avg_c = avgs["carbs_g"]
+    avg_f = avgs["fat_g"]
 
     return (
         f"7-day averages ({n} days logged): {avg_cal:.0f} kcal, "
@@ -108,17 +101,19 @@ async def get_weekly_averages(user_id: str) -> str:
 @tool
 async def search_food_database(user_id: str, query: str, limit: int = 10) -> str:
     """Search the food database by name. Returns matching foods with macros per serving. Favorites are marked with [FAVORITE]."""
-    foods = await Food.find(
-        {"$text": {"$search": query}},
-        limit=limit,
-    ).to_list()
+    foods = await find_foods(query, limit=limit)
+    if not foods:
+        # Nothing matches as typed — try correcting misspellings
+        foods = [f for f, _ in await match_foods(query, limit=limit)]
 
     if not foods:
         return f"No foods found matching '{query}'."
 
-    # Check user favorites
+    # Put the user's usual foods first and mark favorites
     user = await User.get(user_id)
     fav_ids = set(user.favorite_foods) if user else set()
+    if user:
+        foods = await rerank_for_user(user, foods, lambda f: str(f.id))
 
     lines = []
     for f in foods:
@@ -133,6 +128,50 @@ async def search_food_database(user_id: str, query: str, limit: int = 10) -> str
     return "\n".join(lines)
 
 
+@tool
+async def find_similar_foods(
+    food_names: list[str],
+    more: list[str] | None = None,
+    less: list[str] | None = None,
+    limit: int = 5,
+) -> str:
+    """Find substitutes: foods with the closest nutrient profile (per 100g) to each named food.
+    Pass several names at once to get substitutes for a whole meal in one call.
+    Optional constraints: more / less take nutrient names (calories, protein_g, carbs_g, fat_g,
+    fiber_g, sugar_g, sodium_mg, saturated_fat_g) the substitute must have more / less of,
+    e.g. more=["protein_g"], less=["saturated_fat_g"]."""
+    index = await get_food_index()
+    if index is None:
+        return "Similar-food search is unavailable right now. Use search_food_database instead."
+
+    lines, sources = [], []
+    for name in food_names[:MAX_SIMILAR_FOODS]:
+        candidates = await match_foods(name, limit=1)
+        if candidates and candidates[0][1] >= SIMILAR_FOODS_MIN_SCORE:
+            sources.append(candidates[0][0])
+        else:
+            lines.append(f"'{name}': not found in the food database.")
+
+    try:
+        results = index.similar(sources, limit=limit, more=more or [], less=less or [])
+    except ValueError as e:
+        return str(e)
+
+    for source, neighbours in zip(sources, results):
+        lines.append(f"Similar to {source.name}:")
+        if not neighbours:
+            lines.append("- No foods match these constraints.")
+        for f, score in neighbours:
+            lines.append(
+                f"- {f.name} ({score:.0%} similar, per {f.serving.label}): "
+                f"{f.calories:.0f} kcal, {f.protein_g:.0f}g P, "
+                f"{f.carbs_g:.0f}g C, {f.fat_g:.0f}g F, "
+                f"{f.fiber_g:.0f}g fiber, {f.sugar_g:.0f}g sugar, "
+                f"{f.sodium_mg:.0f}mg sodium, {f.saturated_fat_g:.0f}g sat fat"
+            )
+    return "\n".join(lines)
+
+
 @tool
 async def get_weight_trend(user_id: str, days: int = 14) -> str:
     """Get recent weight entries and trend over the specified number of days."""
@@ -190,7 +229,8 @@ async def log_food(
         sodium_mg=sodium_mg,
         saturated_fat_g=saturated_fat_g,
     )
-    await entry.insert()
+    if await insert_entries([entry]):
+        return f"Failed to log {entry.food_name} — please try again."
     return f"Logged: {food_name} ({meal}) — {calories:.0f} kcal"
 
 
@@ -229,15 +269,18 @@ async def quick_log(
             food_query = description.strip()
 
     # Search for the food
-    foods = await Food.find(
-        {"$text": {"$search": food_query}},
-        limit=3,
-    ).to_list()
+    candidates = await match_foods(food_query, limit=3)
 
-    if not foods:
+    if not candidates:
         return f"Could not find '{food_query}' in the food database. Try searching with search_food_database first, or log manually with log_food."
 
-    food = foods[0]  # Best match
+    food, score = candidates[0]  # Best match
+    if score < QUICK_LOG_MIN_SCORE:
+        closest = ", ".join(f"{f.name} ({s:.0%} match)" for f, s in candidates)
+        return (
+            f"No confident match for '{food_query}'. Closest foods: {closest}. "
+            "Ask the user which one they meant, then call quick_log again with that name."
+        )
 
     # Calculate multiplier based on unit
     if unit == "g":
@@ -270,7 +313,8 @@ async def quick_log(
         sodium_mg=food.sodium_mg * multiplier,
         saturated_fat_g=food.saturated_fat_g * multiplier,
     )
-    await entry.insert()
+    if await insert_entries([entry]):
+        return f"Failed to log {entry.food_name} — please try again."
 
     return (
         f"Logged: {food.name} ({amount}{unit}) for {meal} — "
@@ -283,11 +327,7 @@ async def quick_log(
 async def get_nutrient_alerts(user_id: str) -> str:
     """Check today's intake against nutrient limits (sodium, sugar, saturated fat, fiber, protein). Returns any active warnings or info alerts."""
     user = await User.get(user_id)
-    protein_target = user.targets.protein_g if user.targets else 0
-    alerts = await check_nutrient_alerts(
-        user_id=user_id,
-        protein_target=protein_target,
-    )
+    alerts = await check_nutrient_alerts(DayContext(user=user))
     if not alerts:
         return "No nutrient alerts — all within healthy limits."
     return "\n".join(f"- [{a['severity'].upper()}] {a['message']}" for a in alerts)
@@ -299,24 +339,13 @@ async def get_weekly_report(user_id: str) -> str:
     today = date.today()
     week_ago = today - timedelta(days=6)
 
-    entries = await FoodLog.find(
-        FoodLog.user_id == user_id,
-        FoodLog.date >= week_ago,
-        FoodLog.date <= today,
-    ).to_list()
+    days = await daily_totals(user_id, week_ago, today)
 
-    if not entries:
+    if not days:
         return "No food logged in the past 7 days."
 
-    daily: dict[date, list] = {}
-    for e in entries:
-        daily.setdefault(e.date, []).append(e)
-
-    n = len(daily)
-    keys = ["calories", "protein_g", "carbs_g", "fat_g", "fiber_g", "sugar_g", "sodium_mg", "saturated_fat_g"]
-    avgs = {}
-    for k in keys:
-        avgs[k] = sum(sum(getattr(e, k) for e in day) for day in daily.values()) / n
+    n = len(days)
+    avgs = average_totals(days)
 
     # Get user targets
     user = await User.get(user_id)
@@ -364,14 +393,9 @@ async def suggest_meals(user_id: str, meal: str = "", max_results: int = 5) -> s
         return "Cannot suggest meals — user targets not set."
 
     # Calculate remaining budget
-    today = date.today()
-    entries = await FoodLog.find(
-        FoodLog.user_id == user_id,
-        FoodLog.date == today,
-    ).to_list()
-
-    eaten_cal = sum(e.calories for e in entries)
-    eaten_p = sum(e.protein_g for e in entries)
+    totals = await get_daily_summary(user_id, date.today())
+    eaten_cal = totals.calories
+    eaten_p = totals.protein_g
     remaining_cal = max(user.targets.calories - eaten_cal, 0)
     remaining_p = max(user.targets.protein_g - eaten_p, 0)
 
@@ -0,0 +1,233 @@
+"""Daily checklist generation, auto-check evaluation and streak tracking."""
+
+import hashlib
+from datetime import date, datetime, timedelta
+
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.models.checklist import ChecklistItem, ChecklistStreak
+from app.models.daily_summary import DailySummary
+from app.models.user import User
+from app.services.daily_summary import NUTRIENT_KEYS
+from app.services.day_context import DayContext
+from app.utils.dates import mongo_date
+
+STREAK_THRESHOLD = 0.8  # a day counts toward the streak at >= 80% complete
+STREAK_LOOKBACK_DAYS = 365
+
+DUPLICATE_KEY = 11000
+
+
+# Default auto-check items generated from user targets
+def build_default_items(user: User) -> list[dict]:
+    items = []
+    t = user.targets
+    if t:
+        if t.calories > 0:
+            items.append({
+                "title": f"Hit calorie target ({t.calories} kcal)",
+                "auto_check_field": "calories",
+                "auto_check_target": t.calories * 0.9,  # 90% threshold
+            })
+        if t.protein_g > 0:
+            items.append({
+                "title": f"Hit protein target ({t.protein_g}g)",
+                "auto_check_field": "protein_g",
+                "auto_check_target": t.protein_g * 0.9,
+            })
+    # Always include these
+    items.append({
+        "title": "Log at least 3 meals",
+        "auto_check_field": "entry_count",
+        "auto_check_target": 3,
+    })
+    items.append({
+        "title": "Get 25g+ fiber",
+        "auto_check_field": "fiber_g",
+        "auto_check_target": 25,
+    })
+    return items
+
+
+def _default_item_id(user_id: str, day: date, field: str) -> PydanticObjectId:
+    """Deterministic id for a default item.
+
+    Concurrent first views of the same day then collide on `_id` instead of
+    inserting two default sets.
+    """
+    digest = hashlib.sha1(f"{user_id}:{day.isoformat()}:{field}".encode()).digest()
+    return PydanticObjectId(digest[:12])
+
+
+def _apply_auto_checks(items: list[ChecklistItem], summary: DailySummary) -> list[ChecklistItem]:
+    """Set `checked` on auto items from the day's totals and return the ones that changed."""
+    totals = {key: getattr(summary, key) for key in NUTRIENT_KEYS}
+    totals["entry_count"] = summary.entry_count
+
+    changed = []
+    for item in items:
+        if item.type != "auto" or not item.auto_check_field:
+            continue
+        should_check = totals.get(item.auto_check_field, 0) >= item.auto_check_target
+        if should_check != item.checked:
+            item.checked = should_check
+            changed.append(item)
+    return changed
+
+
+async def auto_check_items(ctx: DayContext) -> list[ChecklistItem]:
+    """Update auto-check items based on current food log data.
+
+    State is computed in memory; only items whose state flipped are written,
+    in one bulk_write.
+    """
+    items = await ctx.checklist_items()
+    if not any(i.type == "auto" and i.auto_check_field for i in items):
+        return items
+
+    changed = _apply_auto_checks(items, await ctx.summary())
+    if changed:
+        await ChecklistItem.get_pymongo_collection().bulk_write(
+            [UpdateOne({"_id": i.id}, {"$set": {"checked": i.checked}}) for i in changed],
+            ordered=False,
+        )
+        await record_checklist_change(ctx.user_id, ctx.date, items)
+    return items
+
+
+async def _insert_defaults(ctx: DayContext) -> list[ChecklistItem] | None:
+    """Insert the default set in one insert_many; None if another request already did."""
+    items = [
+        ChecklistItem(
+            id=_default_item_id(ctx.user_id, ctx.date, d["auto_check_field"]),
+            user_id=ctx.user_id,
+            date=ctx.date,
+            title=d["title"],
+            type="auto",
+            auto_check_field=d["auto_check_field"],
+            auto_check_target=d["auto_check_target"],
+        )
+        for d in build_default_items(ctx.user)
+    ]
+    # Evaluate before inserting so fresh defaults never need a follow-up write
+    _apply_auto_checks(items, await ctx.summary())
+
+    try:
+        await ChecklistItem.insert_many(items, ordered=False)
+    except BulkWriteError as e:
+        if any(err.get("code") != DUPLICATE_KEY for err in e.details.get("writeErrors", [])):
+            raise
+        return None
+    return items
+
+
+async def get_day_checklist(ctx: DayContext) -> list[ChecklistItem]:
+    """Get the day's checklist, generating default items on first view and running auto-check."""
+    items = await ctx.checklist_items()
+    if items:
+        return await auto_check_items(ctx)
+
+    # No items for the day yet — generate defaults
+    items = await _insert_defaults(ctx)
+    if items is None:
+        # Lost the race to a concurrent request; use the set it stored
+        ctx.set_checklist_items(None)
+        return await auto_check_items(ctx)
+
+    ctx.set_checklist_items(items)
+    await record_checklist_change(ctx.user_id, ctx.date, items)
+    return items
+
+
+# ── Streak ───────────────────────────────────────────────
+
+
+def completion_ratio(items: list[ChecklistItem]) -> float:
+    if not items:
+        return 0
+    return sum(1 for i in items if i.checked) / len(items)
+
+
+async def _compute_streak(user_id: str, today: date) -> tuple[int, float]:
+    """Compute (streak ending yesterday, today's completion) with one aggregation."""
+    start = today - timedelta(days=STREAK_LOOKBACK_DAYS)
+    pipeline = [
+        {"$match": {
+            "user_id": user_id,
+            "date": {"$gte": mongo_date(start), "$lte": mongo_date(today)},
+        }},
+        {"$group": {
+            "_id": "$date",
+            "total": {"$sum": 1},
+            "checked": {"$sum": {"$cond": ["$checked", 1, 0]}},
+        }},
+    ]
+    cursor = ChecklistItem.get_pymongo_collection().aggregate(pipeline)
+    completion = {row["_id"].date(): row["checked"] / row["total"] async for row in cursor}
+
+    # Walk backwards from yesterday (today might not be complete yet)
+    streak = 0
+    day = today - timedelta(days=1)
+    while day >= start and completion.get(day, 0) >= STREAK_THRESHOLD:
+        streak += 1
+        day -= timedelta(days=1)
+    return streak, completion.get(today, 0)
+
+
+async def get_streak(user_id: str) -> ChecklistStreak:
+    """Get the user's streak, recomputing it only when the cached record is stale."""
+    today = date.today()
+    record = await ChecklistStreak.find_one(ChecklistStreak.user_id == user_id)
+    if record and record.through_date == today:
+        return record
+
+    streak, today_completion = await _compute_streak(user_id, today)
+    record = ChecklistStreak(
+        user_id=user_id,
+        streak=streak,
+        through_date=today,
+        today_completion=today_completion,
+    )
+    await ChecklistStreak.get_pymongo_collection().update_one(
+        {"user_id": user_id},
+        {"$set": {
+            "streak": streak,
+            "through_date": mongo_date(today),
+            "today_completion": today_completion,
+            "updated_at": record.updated_at,
+        }},
+        upsert=True,
+    )
+    return record
+
+
+async def record_checklist_change(
+    user_id: str, day: date, items: list[ChecklistItem] | None = None
+):
+    """Keep the cached streak in step after a day's checklist changed.
+
+    A change to today only moves today's completion; a change to an earlier day
+    can break or extend the run, so the record is marked stale instead.
+    """
+    today = date.today()
+    collection = ChecklistStreak.get_pymongo_collection()
+    now = datetime.utcnow()
+
+    if day == today:
+        if items is None:
+            items = await ChecklistItem.find(
+                ChecklistItem.user_id == user_id,
+                ChecklistItem.date == day,
+            ).to_list()
+        # No-op if the record is already stale — the next read recomputes everything
+        await collection.update_one(
+            {"user_id": user_id, "through_date": mongo_date(today)},
+            {"$set": {"today_completion": completion_ratio(items), "updated_at": now}},
+        )
+    elif day < today:
+        await collection.update_one(
+            {"user_id": user_id},
+            {"$set": {"through_date": None, "updated_at": now}},
+        )
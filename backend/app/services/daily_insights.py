@@ -1,32 +1,23 @@
-from datetime import date
+from app.services.day_context import DayContext
 
-from app.models.food_log import FoodLog
-from app.models.user import User
 
-
-async def generate_daily_insights(user_id: str, target_date: date | None = None) -> list[dict]:
+async def generate_daily_insights(ctx: DayContext) -> list[dict]:
     """Generate rule-based daily insights comparing intake to targets."""
-    target_date = target_date or date.today()
-
-    user = await User.get(user_id)
-    if not user or not user.targets:
+    user = ctx.user
+    if not user.targets:
         return []
 
-    entries = await FoodLog.find(
-        FoodLog.user_id == user_id,
-        FoodLog.date == target_date,
-    ).to_list()
+    summary = await ctx.summary()
 
-    if not entries:
+    if summary.entry_count <= 0:
         return [{"type": "info", "message": "No food logged yet today. Start tracking to see insights."}]
 
     targets = user.targets
-    cal = sum(e.calories for e in entries)
-    protein = sum(e.protein_g for e in entries)
-    carbs = sum(e.carbs_g for e in entries)
-    fat = sum(e.fat_g for e in entries)
-    fiber = sum(e.fiber_g for e in entries)
-    entry_count = len(entries)
+    cal = summary.calories
+    protein = summary.protein_g
+    fat = summary.fat_g
+    fiber = summary.fiber_g
+    entry_count = summary.entry_count
 
     insights: list[dict] = []
 
@@ -74,7 +65,7 @@ async def generate_daily_insights(user_id: str, target_date: date | None = None)
         })
 
     # Meal balance
-    meals = set(e.meal for e in entries)
+    meals = [meal for meal, count in summary.meals.items() if count > 0]
     if len(meals) == 1 and entry_count >= 3:
         insights.append({
             "type": "info",
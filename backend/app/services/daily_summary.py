@@ -0,0 +1,185 @@
+"""Per-day nutrient rollups maintained alongside food log writes.
+
+Every code path that inserts or deletes ``FoodLog`` documents calls
+``record_entries`` / ``remove_entries`` so the matching ``DailySummary`` is
+adjusted with a single atomic ``$inc``. Readers then fetch one small document
+per day instead of re-summing every entry.
+"""
+
+from datetime import date, datetime
+
+from pymongo import ReplaceOne, UpdateOne
+
+from app.models.daily_summary import DailySummary
+from app.models.food_log import FoodLog
+from app.utils.dates import mongo_date
+
+NUTRIENT_KEYS = [
+    "calories", "protein_g", "carbs_g", "fat_g",
+    "fiber_g", "sugar_g", "sodium_mg", "saturated_fat_g",
+]
+
+# Float $inc accumulates rounding error, so the consistency check allows a little slack
+CHECK_TOLERANCE = 0.01
+
+
+def _meal_key(meal: str) -> str:
+    # Meal names become field paths under `meals`, so strip path/operator characters
+    return meal.replace(".", "_").replace("$", "_") or "snack"
+
+
+async def _apply(entries: list[FoodLog], sign: int):
+    deltas: dict[tuple[str, date], dict[str, float]] = {}
+    for e in entries:
+        inc = deltas.setdefault((e.user_id, e.date), {})
+        for key in NUTRIENT_KEYS:
+            inc[key] = inc.get(key, 0) + sign * getattr(e, key)
+        inc["entry_count"] = inc.get("entry_count", 0) + sign
+        meal_field = f"meals.{_meal_key(e.meal)}"
+        inc[meal_field] = inc.get(meal_field, 0) + sign
+
+    if not deltas:
+        return
+
+    now = datetime.utcnow()
+    collection = DailySummary.get_pymongo_collection()
+    await collection.bulk_write(
+        [
+            UpdateOne(
+                {"user_id": user_id, "date": mongo_date(d)},
+                {"$inc": inc, "$set": {"updated_at": now}},
+                upsert=True,
+            )
+            for (user_id, d), inc in deltas.items()
+        ],
+        ordered=False,
+    )
+
+    if sign < 0:
+        # Drop days that no longer have any entries
+        await collection.delete_many({
+            "$or": [{"user_id": user_id, "date": mongo_date(d)} for user_id, d in deltas],
+            "entry_count": {"$lte": 0},
+        })
+
+
+async def record_entries(entries: list[FoodLog]):
+    """Add newly inserted food log entries to their daily summaries."""
+    await _apply(entries, 1)
+
+
+async def remove_entries(entries: list[FoodLog]):
+    """Subtract deleted food log entries from their daily summaries."""
+    await _apply(entries, -1)
+
+
+async def get_daily_summary(user_id: str, target_date: date) -> DailySummary:
+    """Get the summary for one day (an empty, unsaved summary if nothing is logged)."""
+    summary = await DailySummary.find_one(
+        DailySummary.user_id == user_id,
+        DailySummary.date == target_date,
+    )
+    return summary or DailySummary(user_id=user_id, date=target_date)
+
+
+async def get_range_summaries(user_id: str, start: date, end: date) -> list[DailySummary]:
+    """Get summaries for every logged day in [start, end], sorted by date."""
+    return await DailySummary.find(
+        DailySummary.user_id == user_id,
+        DailySummary.date >= start,
+        DailySummary.date <= end,
+        DailySummary.entry_count > 0,
+    ).sort("+date").to_list()
+
+
+# ── Rebuild / consistency check ──────────────────────────
+
+
+async def _totals_from_logs(user_id: str | None) -> dict[tuple[str, datetime], dict]:
+    """Recompute per-day totals straight from food_logs."""
+    match = {"user_id": user_id} if user_id else {}
+    pipeline = [
+        {"$match": match},
+        {"$group": {
+            "_id": {"user_id": "$user_id", "date": "$date", "meal": "$meal"},
+            **{key: {"$sum": f"${key}"} for key in NUTRIENT_KEYS},
+            "entry_count": {"$sum": 1},
+        }},
+    ]
+    days: dict[tuple[str, datetime], dict] = {}
+    cursor = FoodLog.get_pymongo_collection().aggregate(pipeline, allowDiskUse=True)
+    async for row in cursor:
+        key = (row["_id"]["user_id"], row["_id"]["date"])
+        empty = {k: 0.0 for k in NUTRIENT_KEYS} | {"entry_count": 0, "meals": {}}
+        day = days.setdefault(key, empty)
+        for k in NUTRIENT_KEYS:
+            day[k] += row[k]
+        day["entry_count"] += row["entry_count"]
+        meal = _meal_key(row["_id"]["meal"] or "snack")
+        day["meals"][meal] = day["meals"].get(meal, 0) + row["entry_count"]
+    return days
+
+
+async def rebuild_summaries(user_id: str | None = None, batch_size: int = 1000) -> int:
+    """Recompute summaries from food_logs, replacing whatever is stored.
+
+    Returns the number of days written. Writes that land while the rebuild
+    runs may be overwritten, so run it during low traffic (or follow with
+    ``check_summaries``).
+    """
+    expected = await _totals_from_logs(user_id)
+    collection = DailySummary.get_pymongo_collection()
+    now = datetime.utcnow()
+
+    ops = []
+    for (uid, d), totals in expected.items():
+        ops.append(ReplaceOne(
+            {"user_id": uid, "date": d},
+            {"user_id": uid, "date": d, **totals, "updated_at": now},
+            upsert=True,
+        ))
+        if len(ops) >= batch_size:
+            await collection.bulk_write(ops, ordered=False)
+            ops = []
+    if ops:
+        await collection.bulk_write(ops, ordered=False)
+
+    # Remove summaries for days that no longer have entries
+    match = {"user_id": user_id} if user_id else {}
+    stale = []
+    async for doc in collection.find(match, {"user_id": 1, "date": 1}):
+        if (doc["user_id"], doc["date"]) not in expected:
+            stale.append(doc["_id"])
+    if stale:
+        await collection.delete_many({"_id": {"$in": stale}})
+
+    return len(expected)
+
+
+async def check_summaries(user_id: str | None = None) -> list[dict]:
+    """Compare stored summaries to food_logs and return every mismatch found."""
+    expected = await _totals_from_logs(user_id)
+    match = {"user_id": user_id} if user_id else {}
+    stored: dict[tuple[str, datetime], dict] = {}
+    async for doc in DailySummary.get_pymongo_collection().find(match):
+        stored[(doc["user_id"], doc["date"])] = doc
+
+    mismatches = []
+    for key in expected.keys() | stored.keys():
+        uid, d = key
+        want = expected.get(key)
+        have = stored.get(key)
+        if want is None and have and have.get("entry_count", 0) <= 0:
+            continue
+        for field in NUTRIENT_KEYS + ["entry_count"]:
+            want_value = want[field] if want else 0
+            have_value = have.get(field, 0) if have else 0
+            if abs(want_value - have_value) > CHECK_TOLERANCE:
+                mismatches.append({
+                    "user_id": uid,
+                    "date": d.date().isoformat(),
+                    "field": field,
+                    "expected": want_value,
+                    "actual": have_value,
+                })
+    return mismatches
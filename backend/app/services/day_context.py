@@ -0,0 +1,78 @@
+"""Request-scoped loader for one user's day.
+
+A ``DayContext`` fetches the day's food log entries, summary and checklist
+items at most once and shares them between insights, alerts and auto-check,
+so a composite view (or one endpoint that needs several of them) does not
+query the same rows repeatedly.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+
+from app.models.checklist import ChecklistItem
+from app.models.daily_summary import DailySummary
+from app.models.food_log import FoodLog
+from app.models.user import User
+from app.services.daily_summary import NUTRIENT_KEYS, get_daily_summary
+
+
+@dataclass
+class DayContext:
+    user: User
+    date: date = field(default_factory=date.today)
+
+    _entries: list[FoodLog] | None = field(default=None, init=False, repr=False)
+    _summary: DailySummary | None = field(default=None, init=False, repr=False)
+    _checklist: list[ChecklistItem] | None = field(default=None, init=False, repr=False)
+
+    @property
+    def user_id(self) -> str:
+        return str(self.user.id)
+
+    async def entries(self) -> list[FoodLog]:
+        """The day's food log entries, ordered by meal then time logged."""
+        if self._entries is None:
+            self._entries = await FoodLog.find(
+                FoodLog.user_id == self.user_id,
+                FoodLog.date == self.date,
+            ).sort("+meal", "+created_at").to_list()
+        return self._entries
+
+    async def summary(self) -> DailySummary:
+        """The day's nutrient totals.
+
+        Derived from the entries when they are already loaded, otherwise read
+        from the stored daily summary.
+        """
+        if self._summary is None:
+            if self._entries is not None:
+                self._summary = _summarize(self.user_id, self.date, self._entries)
+            else:
+                self._summary = await get_daily_summary(self.user_id, self.date)
+        return self._summary
+
+    async def checklist_items(self) -> list[ChecklistItem]:
+        """The day's stored checklist items (defaults are not generated here)."""
+        if self._checklist is None:
+            self._checklist = await ChecklistItem.find(
+                ChecklistItem.user_id == self.user_id,
+                ChecklistItem.date == self.date,
+            ).sort("+created_at").to_list()
+        return self._checklist
+
+    def set_checklist_items(self, items: list[ChecklistItem] | None):
+        """Replace the cached checklist items (None forces a reload on next access)."""
+        self._checklist = items
+
+
+def _summarize(user_id: str, target_date: date, entries: list[FoodLog]) -> DailySummary:
+    meals: dict[str, int] = {}
+    for e in entries:
+        meals[e.meal] = meals.get(e.meal, 0) + 1
+    return DailySummary(
+        user_id=user_id,
+        date=target_date,
+        entry_count=len(entries),
+        meals=meals,
+        **{key: sum(getattr(e, key) for e in entries) for key in NUTRIENT_KEYS},
+    )
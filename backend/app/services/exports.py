@@ -0,0 +1,393 @@
+"""Streaming exports of a user's data.
+
+Exports walk a raw Motor cursor in batches and yield encoded chunks as they
+go, so memory stays flat regardless of how many years are exported and the
+first bytes reach the client immediately.
+"""
+
+import csv
+import io
+import json
+import zlib
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from datetime import date, datetime, timezone
+
+from app.models.checklist import ChecklistItem
+from app.models.food_log import FoodLog
+from app.models.recipe import Recipe
+from app.models.reminder import Reminder
+from app.models.user import User
+from app.models.weight import Weight
+from app.services.daily_summary import NUTRIENT_KEYS
+from app.utils.dates import mongo_date
+
+EXPORT_BATCH_SIZE = 1000
+
+FOOD_LOG_CSV_HEADER = [
+    "Date", "Meal", "Food", "Serving", "Quantity",
+    "Calories", "Protein (g)", "Carbs (g)", "Fat (g)",
+    "Fiber (g)", "Sugar (g)", "Sodium (mg)", "Saturated Fat (g)",
+]
+
+FOOD_LOG_EXPORT_FIELDS = [
+    "date", "meal", "food_name", "serving_label", "quantity",
+    "calories", "protein_g", "carbs_g", "fat_g",
+    "fiber_g", "sugar_g", "sodium_mg", "saturated_fat_g",
+]
+
+
+def food_log_cursor(
+    user_id: str | None,
+    start: date | None = None,
+    end: date | None = None,
+    fields: list[str] = FOOD_LOG_EXPORT_FIELDS,
+):
+    """Raw cursor over food logs in export order (no Beanie validation).
+
+    ``user_id=None`` walks every user's entries, ordered by user.
+    """
+    query: dict = {"user_id": user_id} if user_id else {}
+    if start or end:
+        query["date"] = {}
+        if start:
+            query["date"]["$gte"] = mongo_date(start)
+        if end:
+            query["date"]["$lte"] = mongo_date(end)
+    projection = {field: 1 for field in fields} | {"_id": 0}
+    sort = [("date", 1), ("meal", 1), ("created_at", 1)]
+    if not user_id:
+        sort.insert(0, ("user_id", 1))
+    return (
+        FoodLog.get_pymongo_collection()
+        .find(query, projection)
+        .sort(sort)
+        .batch_size(EXPORT_BATCH_SIZE)
+    )
+
+
+def weight_cursor(user_id: str | None, start: date | None = None, end: date | None = None):
+    """Raw cursor over weight entries ordered by (user and) date."""
+    query: dict = {"user_id": user_id} if user_id else {}
+    if start or end:
+        query["date"] = {}
+        if start:
+            query["date"]["$gte"] = mongo_date(start)
+        if end:
+            query["date"]["$lte"] = mongo_date(end)
+    sort = [("date", 1)] if user_id else [("user_id", 1), ("date", 1)]
+    return (
+        Weight.get_pymongo_collection()
+        .find(query, {"_id": 0, "user_id": 1, "date": 1, "weight_kg": 1, "note": 1})
+        .sort(sort)
+        .batch_size(EXPORT_BATCH_SIZE)
+    )
+
+
+def _csv_row(doc: dict) -> list:
+    return [
+        doc["date"].date().isoformat(),
+        doc.get("meal", ""),
+        doc.get("food_name", ""),
+        doc.get("serving_label", ""),
+        doc.get("quantity", 0),
+        round(doc.get("calories", 0), 1),
+        round(doc.get("protein_g", 0), 1),
+        round(doc.get("carbs_g", 0), 1),
+        round(doc.get("fat_g", 0), 1),
+        round(doc.get("fiber_g", 0), 1),
+        round(doc.get("sugar_g", 0), 1),
+        round(doc.get("sodium_mg", 0), 1),
+        round(doc.get("saturated_fat_g", 0), 1),
+    ]
+
+
+async def food_log_csv_chunks(
+    docs: AsyncIterable[dict], batch_size: int = EXPORT_BATCH_SIZE
+) -> AsyncIterator[str]:
+    """Encode food log documents as CSV, yielding one chunk per `batch_size` rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(FOOD_LOG_CSV_HEADER)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate(0)
+
+    rows = 0
+    async for doc in docs:
+        writer.writerow(_csv_row(doc))
+        rows += 1
+        if rows % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+    tail = buffer.getvalue()
+    if tail:
+        yield tail
+
+
+# ── Full account export ──────────────────────────────────
+
+
+def _json(value) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _food_log_record(doc: dict) -> dict:
+    return {field: doc.get(field) for field in FOOD_LOG_EXPORT_FIELDS} | {
+        "date": doc["date"].date().isoformat(),
+    }
+
+
+def _weight_record(doc: dict) -> dict:
+    return {
+        "date": doc["date"].date().isoformat(),
+        "weight_kg": doc["weight_kg"],
+        "note": doc.get("note", ""),
+    }
+
+
+def _recipe_record(doc: dict) -> dict:
+    return {
+        "name": doc["name"],
+        "description": doc.get("description", ""),
+        "servings": doc.get("servings", 1),
+        "ingredients": [
+            {
+                "food_name": i["food_name"],
+                "quantity": i.get("quantity", 1.0),
+                "calories": i.get("calories", 0),
+                "protein_g": i.get("protein_g", 0),
+                "carbs_g": i.get("carbs_g", 0),
+                "fat_g": i.get("fat_g", 0),
+            }
+            for i in doc.get("ingredients", [])
+        ],
+        "per_serving": doc.get("per_serving", {}),
+    }
+
+
+def _reminder_record(doc: dict) -> dict:
+    return {
+        "type": doc.get("type", "custom"),
+        "title": doc["title"],
+        "time": doc.get("time", ""),
+        "enabled": doc.get("enabled", True),
+    }
+
+
+def _checklist_record(doc: dict) -> dict:
+    return {
+        "title": doc["title"],
+        "type": doc.get("type", "auto"),
+        "checked": doc.get("checked", False),
+        "date": doc["date"].date().isoformat(),
+    }
+
+
+def _account_sections(user_id: str) -> list[tuple[str, object, Callable[[dict], dict]]]:
+    """(section name, cursor, record builder) for every per-user collection."""
+    def cursor(model):
+        collection = model.get_pymongo_collection()
+        return collection.find({"user_id": user_id}).batch_size(EXPORT_BATCH_SIZE)
+
+    return [
+        ("food_logs", food_log_cursor(user_id), _food_log_record),
+        ("weight_entries", weight_cursor(user_id), _weight_record),
+        ("recipes", cursor(Recipe), _recipe_record),
+        ("reminders", cursor(Reminder), _reminder_record),
+        ("checklist", cursor(ChecklistItem), _checklist_record),
+    ]
+
+
+def _account_header(user: User) -> dict:
+    return {
+        "exported_at": datetime.now(timezone.utc).isoformat(),
+        "profile": {
+            "email": user.email,
+            "display_name": user.profile.display_name,
+            "age": user.profile.age,
+            "height_cm": user.profile.height_cm,
+            "weight_kg": user.profile.weight_kg,
+            "gender": user.profile.gender,
+            "activity_level": user.profile.activity_level,
+        },
+        "targets": {
+            "calories": user.targets.calories,
+            "protein_g": user.targets.protein_g,
+            "carbs_g": user.targets.carbs_g,
+            "fat_g": user.targets.fat_g,
+            "fiber_g": user.targets.fiber_g,
+        },
+    }
+
+
+async def account_json_chunks(user: User) -> AsyncIterator[str]:
+    """Encode the full account as one JSON object, written incrementally per record."""
+    header = _json(_account_header(user))
+    yield header[:-1]  # leave the top-level object open
+
+    for name, cursor, to_record in _account_sections(str(user.id)):
+        yield f',"{name}":['
+        parts: list[str] = []
+        first = True
+        async for doc in cursor:
+            parts.append(("" if first else ",") + _json(to_record(doc)))
+            first = False
+            if len(parts) >= EXPORT_BATCH_SIZE:
+                yield "".join(parts)
+                parts = []
+        if parts:
+            yield "".join(parts)
+        yield "]"
+
+    yield "}"
+
+
+async def account_ndjson_chunks(user: User) -> AsyncIterator[str]:
+    """Encode the full account as NDJSON: one `{"kind", "data"}` object per line."""
+    yield _json({"kind": "account", "data": _account_header(user)}) + "\n"
+
+    for name, cursor, to_record in _account_sections(str(user.id)):
+        lines: list[str] = []
+        async for doc in cursor:
+            lines.append(_json({"kind": name, "data": to_record(doc)}) + "\n")
+            if len(lines) >= EXPORT_BATCH_SIZE:
+                yield "".join(lines)
+                lines = []
+        if lines:
+            yield "".join(lines)
+
+
+async def gzip_chunks(chunks: AsyncIterable[str]) -> AsyncIterator[bytes]:
+    """Gzip a stream of text chunks on the fly."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    async for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+# ── Columnar (Parquet / Arrow IPC) export ────────────────
+
+COLUMNAR_BATCH_SIZE = 10_000
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+# (column, kind) — "dict" columns are dictionary-encoded strings
+COLUMNAR_TABLES: dict[str, list[tuple[str, str]]] = {
+    "food_logs": [
+        ("date", "date"),
+        ("meal", "dict"),
+        ("food_name", "dict"),
+        ("serving_label", "dict"),
+        ("quantity", "float"),
+        *[(key, "float") for key in NUTRIENT_KEYS],
+    ],
+    "weights": [
+        ("date", "date"),
+        ("weight_kg", "float"),
+        ("note", "str"),
+    ],
+}
+
+
+def _require_pyarrow():
+    """Import pyarrow lazily — it is only needed for columnar exports."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError(
+            "Columnar export requires pyarrow — install the 'export' extra"
+        ) from e
+    return pa, pq
+
+
+def columnar_available() -> bool:
+    try:
+        _require_pyarrow()
+    except RuntimeError:
+        return False
+    return True
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that buffers writes until drained."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        self._position += len(b)
+        return len(b)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _columnar_schema(pa, table: str, include_user: bool):
+    types = {
+        "date": pa.date32(),
+        "float": pa.float64(),
+        "str": pa.string(),
+        "dict": pa.dictionary(pa.int32(), pa.string()),
+    }
+    columns = ([("user_id", "dict")] if include_user else []) + COLUMNAR_TABLES[table]
+    return columns, pa.schema([(name, types[kind]) for name, kind in columns])
+
+
+def _record_batch(pa, docs: list[dict], columns: list[tuple[str, str]], schema):
+    arrays = []
+    for (name, kind), field in zip(columns, schema):
+        if kind == "date":
+            values = [d[name].date() for d in docs]
+        elif kind == "float":
+            values = [float(d.get(name) or 0) for d in docs]
+        else:
+            values = [d.get(name) or "" for d in docs]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.record_batch(arrays, schema=schema)
+
+
+async def columnar_chunks(
+    docs: AsyncIterable[dict],
+    table: str,
+    fmt: str = "parquet",
+    include_user: bool = False,
+    batch_size: int = COLUMNAR_BATCH_SIZE,
+) -> AsyncIterator[bytes]:
+    """Encode a cursor as zstd-compressed Parquet or Arrow IPC, one record batch at a time.
+
+    Each batch becomes a Parquet row group (or IPC message) and is yielded as
+    soon as it is encoded, so memory is bounded by ``batch_size`` rows.
+    """
+    pa, pq = _require_pyarrow()
+    columns, schema = _columnar_schema(pa, table, include_user)
+    sink = _ChunkSink()
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema, options=pa.ipc.IpcWriteOptions(compression="zstd"))
+
+    batch: list[dict] = []
+    async for doc in docs:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            writer.write_batch(_record_batch(pa, batch, columns, schema))
+            batch = []
+            yield sink.drain()
+    if batch:
+        writer.write_batch(_record_batch(pa, batch, columns, schema))
+    writer.close()
+    yield sink.drain()
@@ -0,0 +1,68 @@
+"""Per-user re-ranking of shared food search results.
+
+Search results are the same for everyone, which keeps them cacheable. On top
+of a shared page this applies a cheap per-user boost read from the user's
+precomputed food stats (how often they log each food) and their favorites, so
+the food someone logs daily moves to the top of the page. Items are only
+reordered within the page, never added or dropped, so paging stays consistent.
+"""
+
+import math
+from collections.abc import Callable
+from typing import TypeVar
+
+from app.models.user import User
+from app.models.user_food_stats import UserFoodStats
+
+T = TypeVar("T")
+
+# Log counts at or above this give the full frequency boost
+AFFINITY_SATURATION = 30
+FREQUENCY_WEIGHT = 0.6
+FAVORITE_WEIGHT = 0.4
+# Relevance spans 1.0 from the top of a page to the bottom, so at this weight a
+# food logged AFFINITY_SATURATION+ times (0.6 affinity) can reach the top
+AFFINITY_WEIGHT = 2.0
+
+
+async def get_affinities(user: User, food_ids: list[str]) -> dict[str, float]:
+    """Affinity in [0, 1] for each of the given foods the user has logged or favorited."""
+    if not food_ids:
+        return {}
+    stats = await UserFoodStats.find(
+        {"user_id": str(user.id), "food_id": {"$in": food_ids}},
+    ).to_list()
+
+    counts: dict[str, int] = {}
+    for s in stats:
+        counts[s.food_id] = counts.get(s.food_id, 0) + s.log_count
+    favorites = set(user.favorite_foods)
+
+    affinities = {}
+    for food_id in food_ids:
+        frequency = min(1.0, math.log1p(counts.get(food_id, 0)) / math.log1p(AFFINITY_SATURATION))
+        favorite = 1.0 if food_id in favorites else 0.0
+        score = FREQUENCY_WEIGHT * frequency + FAVORITE_WEIGHT * favorite
+        if score:
+            affinities[food_id] = score
+    return affinities
+
+
+async def rerank_for_user(user: User, items: list[T], food_id: Callable[[T], str]) -> list[T]:
+    """Reorder one page of shared results by text relevance blended with user affinity.
+
+    ``items`` must be in relevance order; ``food_id`` extracts each item's food id.
+    """
+    if len(items) < 2:
+        return items
+    affinities = await get_affinities(user, [food_id(item) for item in items])
+    if not affinities:
+        return items
+
+    n = len(items)
+    scored = [
+        (1 - i / n + AFFINITY_WEIGHT * affinities.get(food_id(item), 0.0), -i, item)
+        for i, item in enumerate(items)
+    ]
+    scored.sort(key=lambda s: (s[0], s[1]), reverse=True)
+    return [item for _, _, item in scored]
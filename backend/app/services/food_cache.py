@@ -0,0 +1,89 @@
+"""Catalog version and hit/miss counters for cached food lookups.
+
+Cached food search results are keyed by the current catalog version, so any
+write to the catalog invalidates them with a single ``INCR``: later reads build
+keys under the new version and the old entries simply expire. Redis errors are
+never fatal here — callers treat them as a cache miss.
+
+In-process caches registered with ``register_local_cache`` are cleared on
+every bump made by this process, and whenever a read passed to
+``observe_catalog_version`` shows another process has bumped it.
+"""
+
+import logging
+
+from app.redis import get_redis
+from app.utils.lru import TTLCache
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION_KEY = "food:catalog:version"
+CACHE_STATS_KEY = "food:cache:stats"
+
+_local_caches: list[TTLCache] = []
+# Last catalog version this process has seen, to notice other processes' bumps
+_seen_version: int | None = None
+
+
+def register_local_cache(cache: TTLCache) -> TTLCache:
+    """Have ``cache`` cleared whenever this process bumps the catalog version."""
+    _local_caches.append(cache)
+    return cache
+
+
+def observe_catalog_version(version: int):
+    """Note a version just read from Redis, clearing local caches if it moved."""
+    global _seen_version
+    if version != _seen_version:
+        if _seen_version is not None:
+            for cache in _local_caches:
+                cache.clear()
+        _seen_version = version
+
+
+async def get_catalog_version() -> int:
+    """Current catalog version (0 if never bumped)."""
+    return int(await get_redis().get(CATALOG_VERSION_KEY) or 0)
+
+
+async def bump_catalog_version() -> int | None:
+    """Invalidate every cached food lookup. Call after any food create, update or delete.
+
+    Returns the new version, or None if Redis is unavailable.
+    """
+    global _seen_version
+    for cache in _local_caches:
+        cache.clear()
+    try:
+        _seen_version = await get_redis().incr(CATALOG_VERSION_KEY)
+        return _seen_version
+    except Exception:
+        logger.warning("Failed to bump food catalog version; cached searches live until expiry")
+        return None
+
+
+def search_cache_key(version: int, q: str, limit: int, page: int | str) -> str:
+    """Cache key for one page of a search; ``page`` is the offset or cursor."""
+    return f"food:search:v{version}:{q.lower().strip()}:{limit}:{page}"
+
+
+async def record_cache_lookup(cache: str, hit: bool, count: int = 1):
+    """Count hits or misses for one named cache (e.g. "search")."""
+    try:
+        await get_redis().hincrby(CACHE_STATS_KEY, f"{cache}:{'hits' if hit else 'misses'}", count)
+    except Exception:
+        logger.debug("Failed to record cache %s for %s", "hit" if hit else "miss", cache)
+
+
+async def get_cache_stats() -> dict[str, dict[str, int]]:
+    """``{cache: {"hits": n, "misses": n}}`` since the counters were last reset."""
+    raw = await get_redis().hgetall(CACHE_STATS_KEY)
+    stats: dict[str, dict[str, int]] = {}
+    for field, value in raw.items():
+        cache, _, kind = field.rpartition(":")
+        stats.setdefault(cache, {"hits": 0, "misses": 0})[kind] = int(value)
+    return stats
+
+
+async def reset_cache_stats():
+    await get_redis().delete(CACHE_STATS_KEY)
@@ -0,0 +1,348 @@
+"""Streaming, idempotent bulk import into the food catalog.
+
+Rows are read one at a time from a USDA FoodData Central JSON dump (optionally
+gzipped), newline-delimited JSON of FDC foods, or a flat CSV, so memory stays
+bounded by the batch size no matter how large the file is. Each row carries a
+stable ``external_id`` ("fdc:<fdcId>"), its barcode when the dataset has one
+(branded foods' ``gtinUpc``) and a hash of its imported fields:
+batches look up the stored hashes, skip unchanged rows and upsert the rest
+with one unordered ``bulk_write``. Several batches are written concurrently.
+
+Re-running an import is therefore safe and cheap — a monthly refresh only
+writes what changed, and the API keeps serving throughout.
+"""
+
+import asyncio
+import csv
+import gzip
+import hashlib
+import json
+import logging
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import IO
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.models.food import Food
+from app.services.daily_summary import NUTRIENT_KEYS
+from app.utils.barcodes import normalize_barcode
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = 2000
+IMPORT_CONCURRENCY = 4
+IMPORT_FORMATS = ("fdc-json", "ndjson", "csv")
+READ_CHUNK_SIZE = 1 << 20
+# An array item still undecodable after this many chunks is treated as corrupt
+MAX_ITEM_CHUNKS = 2
+DUPLICATE_KEY = 11000
+
+# FoodData Central nutrient numbers for each tracked nutrient, in order of
+# preference (energy falls back to the Atwater factors when 208 is missing)
+FDC_NUTRIENTS = {
+    "calories": ["208", "957", "958"],
+    "protein_g": ["203"],
+    "carbs_g": ["205"],
+    "fat_g": ["204"],
+    "fiber_g": ["291"],
+    "sugar_g": ["269", "269.3"],
+    "sodium_mg": ["307"],
+    "saturated_fat_g": ["606"],
+}
+
+# Serving units whose size can be used as grams directly
+GRAM_UNITS = {"g", "grm", "gm", "ml", "mlt"}
+
+
+@dataclass
+class ImportStats:
+    read: int = 0
+    invalid: int = 0
+    unchanged: int = 0
+    inserted: int = 0
+    updated: int = 0
+    failed: int = 0
+    barcode_conflicts: int = 0
+
+    @property
+    def changed(self) -> int:
+        return self.inserted + self.updated
+
+
+# ── Reading ──────────────────────────────────────────────
+
+
+def open_text(path: Path) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return path.open(encoding="utf-8")
+
+
+def iter_json_array(f: IO[str]) -> Iterator[dict]:
+    """Yield the items of the first JSON array in a file without loading it whole.
+
+    Works for both a bare array and FDC's ``{"BrandedFoods": [...]}`` wrapper.
+    Raises ValueError with the item's character offset in the file when an item
+    is malformed (or larger than ``MAX_ITEM_CHUNKS`` chunks).
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    offset = 0  # position of buf[0] in the file
+    while "[" not in buf:
+        chunk = f.read(READ_CHUNK_SIZE)
+        if not chunk:
+            return
+        buf += chunk
+    pos = buf.index("[") + 1
+
+    while True:
+        # Skip separators, reading more when the buffer runs dry
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf):
+                break
+            chunk = f.read(READ_CHUNK_SIZE)
+            if not chunk:
+                return
+            offset += len(buf)
+            buf, pos = chunk, 0
+        if buf[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError as e:
+            # Item straddles the chunk boundary: keep the tail and read more, but
+            # don't pull the rest of the file into memory for one corrupt row
+            chunk = ""
+            if len(buf) - pos <= MAX_ITEM_CHUNKS * READ_CHUNK_SIZE:
+                chunk = f.read(READ_CHUNK_SIZE)
+            if not chunk:
+                raise ValueError(
+                    f"Malformed JSON at offset {offset + e.pos} "
+                    f"(item starting at offset {offset + pos}): {e.msg}"
+                ) from e
+            offset += pos
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+        yield item
+        pos = end
+
+
+def iter_ndjson(f: IO[str]) -> Iterator[dict]:
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+
+def _fdc_amounts(item: dict) -> dict[str, float]:
+    by_number: dict[str, float] = {}
+    for n in item.get("foodNutrients", []):
+        nutrient = n.get("nutrient") or {}
+        number = str(nutrient.get("number") or n.get("nutrientNumber") or "")
+        amount = n.get("amount", n.get("value"))
+        if number and amount is not None:
+            by_number.setdefault(number, float(amount))
+    amounts = {}
+    for key, numbers in FDC_NUTRIENTS.items():
+        amounts[key] = next((by_number[num] for num in numbers if num in by_number), 0.0)
+    return amounts
+
+
+def fdc_to_record(item: dict) -> dict | None:
+    """Map one FoodData Central food to Food fields (None if it can't be used).
+
+    FDC amounts are per 100 g. Branded foods with a gram/ml serving size are
+    stored per serving, everything else per 100 g.
+    """
+    fdc_id = item.get("fdcId")
+    name = (item.get("description") or "").strip()
+    if not fdc_id or not name:
+        return None
+
+    per_100g = _fdc_amounts(item)
+    size = item.get("servingSize")
+    unit = (item.get("servingSizeUnit") or "").lower()
+    if size and unit in GRAM_UNITS and float(size) > 0:
+        grams = float(size)
+        label = (item.get("householdServingFullText") or "").strip() or f"{grams:g}{unit[0]}"
+    else:
+        grams, label = 100.0, "100g"
+
+    scale = grams / 100
+    return {
+        "external_id": f"fdc:{fdc_id}",
+        "name": name,
+        "brand": (item.get("brandName") or item.get("brandOwner") or "").strip(),
+        "source": "usda",
+        "barcode": normalize_barcode(item.get("gtinUpc") or ""),
+        "serving": {"label": label, "grams": grams},
+        **{key: round(per_100g[key] * scale, 3) for key in NUTRIENT_KEYS},
+    }
+
+
+def csv_to_record(row: dict) -> dict | None:
+    """Map a flat CSV row (Food field names as headers; external_id required)."""
+    external_id = (row.get("external_id") or "").strip()
+    name = (row.get("name") or "").strip()
+    if not external_id or not name:
+        return None
+    try:
+        return {
+            "external_id": external_id,
+            "name": name,
+            "brand": (row.get("brand") or "").strip(),
+            "source": (row.get("source") or "usda").strip(),
+            "barcode": normalize_barcode(row.get("barcode") or ""),
+            "serving": {
+                "label": (row.get("serving_label") or "100g").strip(),
+                "grams": float(row.get("serving_grams") or 100),
+            },
+            **{key: float(row.get(key) or 0) for key in NUTRIENT_KEYS},
+        }
+    except ValueError:
+        return None
+
+
+def read_records(path: Path, fmt: str, stats: ImportStats) -> Iterator[dict]:
+    """Stream mapped Food records from a file, counting rows read and rejected."""
+    with open_text(path) as f:
+        if fmt == "csv":
+            rows, mapper = csv.DictReader(f), csv_to_record
+        elif fmt == "ndjson":
+            rows, mapper = iter_ndjson(f), fdc_to_record
+        else:
+            rows, mapper = iter_json_array(f), fdc_to_record
+        for row in rows:
+            stats.read += 1
+            try:
+                record = mapper(row)
+            except (ValueError, TypeError, AttributeError):
+                record = None
+            if record is None:
+                stats.invalid += 1
+                continue
+            yield record
+
+
+def content_hash(record: dict) -> str:
+    return hashlib.sha1(json.dumps(record, sort_keys=True).encode()).hexdigest()
+
+
+# ── Writing ──────────────────────────────────────────────
+
+
+async def _write_batch(batch: list[dict], stats: ImportStats, dry_run: bool):
+    # Last row wins if an id repeats within the batch
+    records = {r["external_id"]: r for r in batch}
+    hashes = {eid: content_hash(r) for eid, r in records.items()}
+
+    collection = Food.get_pymongo_collection()
+    stored = {}
+    async for doc in collection.find(
+        {"external_id": {"$in": list(records)}}, {"external_id": 1, "content_hash": 1},
+    ):
+        stored[doc["external_id"]] = doc.get("content_hash")
+
+    changed = [eid for eid in records if stored.get(eid) != hashes[eid]]
+    stats.unchanged += len(records) - len(changed)
+    if not changed:
+        return
+    if dry_run:
+        new = sum(1 for eid in changed if eid not in stored)
+        stats.inserted += new
+        stats.updated += len(changed) - new
+        return
+
+    now = datetime.utcnow()
+    upserts = {eid: records[eid] for eid in changed}
+    conflicts = await _upsert(collection, upserts, hashes, now, stats)
+    if conflicts:
+        # The same GTIN can appear on several FDC records; keep the row without it.
+        # Hash what is stored, so the next import tries the barcode again.
+        stats.barcode_conflicts += len(conflicts)
+        retry = {eid: {**records[eid], "barcode": None} for eid in conflicts}
+        retry_hashes = {eid: content_hash(r) for eid, r in retry.items()}
+        await _upsert(collection, retry, retry_hashes, now, stats)
+
+
+async def _upsert(
+    collection, records: dict[str, dict], hashes: dict[str, str], now: datetime, stats: ImportStats,
+) -> list[str]:
+    """Upsert records by external id; returns the ids rejected for a duplicate barcode."""
+    ids = list(records)
+    ops = [
+        UpdateOne(
+            {"external_id": eid},
+            {
+                "$set": {**records[eid], "content_hash": hashes[eid]},
+                "$setOnInsert": {"created_at": now, "created_by": None},
+            },
+            upsert=True,
+        )
+        for eid in ids
+    ]
+    try:
+        result = await collection.bulk_write(ops, ordered=False)
+        stats.inserted += result.upserted_count
+        stats.updated += result.modified_count
+        return []
+    except BulkWriteError as e:
+        details = e.details
+        stats.inserted += details.get("nUpserted", 0)
+        stats.updated += details.get("nModified", 0)
+
+    conflicts = []
+    for err in details.get("writeErrors", []):
+        if err.get("code") == DUPLICATE_KEY and "barcode" in (err.get("keyPattern") or {}):
+            conflicts.append(ids[err["index"]])
+        else:
+            stats.failed += 1
+            logger.warning("Import of %s failed: %s", ids[err["index"]], err.get("errmsg"))
+    return conflicts
+
+
+async def import_foods(
+    path: Path,
+    fmt: str,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    concurrency: int = IMPORT_CONCURRENCY,
+    dry_run: bool = False,
+) -> ImportStats:
+    """Upsert every food in ``path`` into the catalog, skipping unchanged rows.
+
+    At most ``concurrency`` batches are in flight; reading pauses until one
+    finishes, so memory use is bounded by ``(concurrency + 1) * batch_size`` rows.
+    """
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"Unknown import format: {fmt}")
+
+    stats = ImportStats()
+    slots = asyncio.Semaphore(concurrency)
+    tasks: list[asyncio.Task] = []
+
+    async def run(batch: list[dict]):
+        try:
+            await _write_batch(batch, stats, dry_run)
+        finally:
+            slots.release()
+
+    batch: list[dict] = []
+    for record in read_records(path, fmt, stats):
+        batch.append(record)
+        if len(batch) >= batch_size:
+            await slots.acquire()
+            tasks.append(asyncio.create_task(run(batch)))
+            batch = []
+            # File reads are synchronous; let in-flight batches make progress
+            await asyncio.sleep(0)
+    if batch:
+        await slots.acquire()
+        tasks.append(asyncio.create_task(run(batch)))
+
+    await asyncio.gather(*tasks)
+    return stats
@@ -0,0 +1,379 @@
+"""In-process search index over the food catalog.
+
+Food names and brands are split into lowercase tokens. Each token is posted
+both whole and as every leading prefix (edge n-grams), so "chick" finds
+"chicken" without a regex scan. For typo-tolerant matching ("chiken brest")
+each distinct name word is also posted under its character trigrams, so a
+misspelled word is corrected against the vocabulary rather than the whole
+catalog. The index holds the ``Food`` documents themselves, so search and
+autocomplete never touch MongoDB — it stays the source of truth and is only
+read to build the index. It also keeps a nutrient matrix (``food_similarity``)
+for "foods like this one" lookups.
+
+The index is loaded at startup (unless ``FOOD_SEARCH_INDEX`` is turned off,
+e.g. for a catalog too large to hold in memory) and updated by ``index_food``
+when a food is created through the API. Foods written by another process (the
+seed script, an import) are picked up by a periodic catalog version and count
+check. Callers fall back to MongoDB ``$text`` search whenever
+``get_food_index`` returns None.
+"""
+
+import asyncio
+import heapq
+import logging
+import re
+import time
+from collections import Counter
+from difflib import SequenceMatcher
+
+from app.config import settings
+from app.models.food import Food
+from app.services.food_cache import get_catalog_version
+from app.services.food_search import text_search
+from app.services.food_similarity import NutrientMatrix
+
+logger = logging.getLogger(__name__)
+
+# Prefixes are posted up to this length; longer terms are verified against the tokens
+MAX_PREFIX_LENGTH = 20
+# How often (seconds) to compare the indexed count with the collection
+REFRESH_CHECK_INTERVAL = 60
+# Fuzzy matching: how many vocabulary words to consider per misspelled query
+# word, how close (difflib ratio) a correction must be, what an unfinished word
+# ("chick") is worth, and the lowest overall score returned
+FUZZY_WORD_CANDIDATES = 8
+FUZZY_WORD_MIN_SIMILARITY = 0.7
+FUZZY_PREFIX_SIMILARITY = 0.9
+FUZZY_MIN_SCORE = 0.4
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase alphanumeric tokens, in order (duplicates kept)."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def trigrams(text: str) -> set[str]:
+    """Padded character trigrams of each token ("egg" -> "  e", " eg", "egg", "gg ")."""
+    grams = set()
+    for token in tokenize(text):
+        padded = f"  {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _stem(term: str) -> str:
+    # Cheap plural folding: "eggs" -> "egg", "oats" -> "oat"
+    return term[:-1] if len(term) > 3 and term.endswith("s") else term
+
+
+class FoodSearchIndex:
+    def __init__(self):
+        self._foods: list[Food] = []
+        self._positions: dict[str, int] = {}
+        # Tiebreak within a relevance tier: shorter names first, then alphabetical
+        self._order: list[tuple[int, str]] = []
+        self._name_tokens: dict[str, set[int]] = {}
+        self._name_prefixes: dict[str, set[int]] = {}
+        self._brand_prefixes: dict[str, set[int]] = {}
+        self._word_trigrams: dict[str, set[str]] = {}
+        self._nutrients = NutrientMatrix()
+
+    def __len__(self) -> int:
+        return len(self._foods)
+
+    def add(self, food: Food):
+        """Index a food, replacing any earlier version with the same id."""
+        food_id = str(food.id)
+        pos = self._positions.get(food_id)
+        if pos is None:
+            pos = len(self._foods)
+            self._positions[food_id] = pos
+            self._foods.append(food)
+            self._order.append((0, ""))
+        else:
+            self._remove_postings(pos)
+            self._foods[pos] = food
+        self._nutrients.set(pos, food)
+
+        self._order[pos] = (len(food.name), food.name.lower())
+        for token in set(tokenize(food.name)):
+            if token not in self._name_tokens:
+                for gram in trigrams(token):
+                    self._word_trigrams.setdefault(gram, set()).add(token)
+            self._name_tokens.setdefault(token, set()).add(pos)
+            for prefix in _prefixes(token):
+                self._name_prefixes.setdefault(prefix, set()).add(pos)
+        for token in set(tokenize(food.brand)):
+            for prefix in _prefixes(token):
+                self._brand_prefixes.setdefault(prefix, set()).add(pos)
+
+    def get(self, food_id: str) -> Food | None:
+        pos = self._positions.get(food_id)
+        return self._foods[pos] if pos is not None else None
+
+    def _remove_postings(self, pos: int):
+        food = self._foods[pos]
+        for token in set(tokenize(food.name)):
+            self._name_tokens.get(token, set()).discard(pos)
+            for prefix in _prefixes(token):
+                self._name_prefixes.get(prefix, set()).discard(pos)
+        for token in set(tokenize(food.brand)):
+            for prefix in _prefixes(token):
+                self._brand_prefixes.get(prefix, set()).discard(pos)
+
+    def _lookup(self, table: dict[str, set[int]], term: str) -> set[int]:
+        found = table.get(term[:MAX_PREFIX_LENGTH], set())
+        if len(term) > MAX_PREFIX_LENGTH and found:
+            # Postings stop at MAX_PREFIX_LENGTH, so check long terms against the real tokens
+            found = {
+                pos for pos in found
+                if any(
+                    token.startswith(term)
+                    for token in tokenize(f"{self._foods[pos].name} {self._foods[pos].brand}")
+                )
+            }
+        return found
+
+    def _tiers(self, term: str) -> list[set[int]]:
+        """Foods matching one term, best tier first: whole name word, name prefix, brand prefix."""
+        stem = _stem(term)
+        exact = self._name_tokens.get(term, set()) | self._name_tokens.get(stem, set())
+        name = self._lookup(self._name_prefixes, term)
+        brand = self._lookup(self._brand_prefixes, term)
+        if not name and not brand and stem != term:
+            name = self._lookup(self._name_prefixes, stem)
+            brand = self._lookup(self._brand_prefixes, stem)
+        name = name - exact
+        return [exact, name, brand - exact - name]
+
+    def _top(self, candidates: set[int], n: int) -> list[int]:
+        return heapq.nsmallest(n, candidates, key=self._order.__getitem__)
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> tuple[list[Food], int]:
+        """Ranked foods for a query (every term matched as a word or prefix), plus the total.
+
+        Foods matching every term rank first by how strongly they match
+        (whole name word > name prefix > brand). If no food matches every
+        term, foods matching any of them are returned instead, like ``$text``.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return [], 0
+        tiers = [self._tiers(t) for t in terms]
+        want = offset + limit
+
+        if len(terms) == 1:
+            # Walk the tiers in order so only the page, not every match, gets sorted
+            ranked: list[int] = []
+            for tier in tiers[0]:
+                if len(ranked) >= want:
+                    break
+                ranked.extend(self._top(tier, want - len(ranked)))
+            total = sum(len(tier) for tier in tiers[0])
+            return [self._foods[pos] for pos in ranked[offset:want]], total
+
+        matches = [set().union(*t) for t in tiers]
+        candidates = set.intersection(*matches)
+        required = len(terms)
+        if not candidates:
+            candidates = set().union(*matches)
+            required = 1
+
+        scored = []
+        for pos in candidates:
+            matched = score = 0
+            for exact, name, brand in tiers:
+                if pos in exact:
+                    matched, score = matched + 1, score + 3
+                elif pos in name:
+                    matched, score = matched + 1, score + 2
+                elif pos in brand:
+                    matched, score = matched + 1, score + 1
+            if matched >= required:
+                scored.append(((-matched, -score, self._order[pos]), pos))
+        top = heapq.nsmallest(want, scored)
+        return [self._foods[pos] for _, pos in top[offset:]], len(scored)
+
+    def autocomplete(self, prefix: str, limit: int = 10) -> list[Food]:
+        """Best foods for a partially typed query."""
+        return self.search(prefix, limit=limit)[0]
+
+    def _corrections(self, term: str) -> list[tuple[set[int], float]]:
+        """Postings that could stand for one query word, each with its similarity to it."""
+        exact = self._name_tokens.get(term)
+        if exact:
+            return [(exact, 1.0)]
+        if len(term) >= 3:
+            prefixed = self._lookup(self._name_prefixes, term)
+            if prefixed:
+                return [(prefixed, FUZZY_PREFIX_SIMILARITY)]
+
+        shared = Counter()
+        for gram in trigrams(term):
+            shared.update(self._word_trigrams.get(gram, ()))
+        corrections = []
+        for word, _ in shared.most_common(FUZZY_WORD_CANDIDATES):
+            similarity = SequenceMatcher(None, term, word).ratio()
+            postings = self._name_tokens.get(word)
+            if postings and similarity >= FUZZY_WORD_MIN_SIMILARITY:
+                corrections.append((postings, similarity))
+        return corrections
+
+    def fuzzy(
+        self, query: str, limit: int = 5, min_score: float = FUZZY_MIN_SCORE,
+    ) -> list[tuple[Food, float]]:
+        """Foods whose names best match a possibly misspelled query, with scores in [0, 1].
+
+        Each query word is corrected against the name vocabulary; a food's
+        score is the mean over query words of its best correction's
+        similarity (0 for a word it doesn't contain). Foods containing every
+        word are preferred, as in ``search``.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        per_term = [self._corrections(t) for t in terms]
+        matches = [set().union(*(postings for postings, _ in c)) for c in per_term]
+        candidates = set.intersection(*matches) or set().union(*matches)
+
+        scored = []
+        for pos in candidates:
+            total = 0.0
+            for corrections in per_term:
+                total += max((sim for postings, sim in corrections if pos in postings), default=0.0)
+            score = total / len(terms)
+            if score >= min_score:
+                scored.append((-score, self._order[pos], pos))
+        return [(self._foods[pos], -neg) for neg, _, pos in heapq.nsmallest(limit, scored)]
+
+    def similar(
+        self,
+        foods: list[Food],
+        limit: int = 10,
+        more: list[str] = (),
+        less: list[str] = (),
+    ) -> list[list[tuple[Food, float]]]:
+        """Foods with the closest nutrient profile to each of ``foods``, best first.
+
+        See ``NutrientMatrix.nearest`` for ``more`` / ``less``. Foods that are not
+        indexed get no results. Raises ValueError for an unknown nutrient name.
+        """
+        positions = [self._positions.get(str(f.id)) for f in foods]
+        found = [pos for pos in positions if pos is not None]
+        neighbours = iter(self._nutrients.nearest(found, limit, more=more, less=less))
+        return [
+            [(self._foods[p], score) for p, score in next(neighbours)] if pos is not None else []
+            for pos in positions
+        ]
+
+
+def _prefixes(token: str) -> list[str]:
+    return [token[:end] for end in range(1, min(len(token), MAX_PREFIX_LENGTH) + 1)]
+
+
+_index: FoodSearchIndex | None = None
+# Catalog version the index reflects (None if Redis was unavailable when loading)
+_version: int | None = None
+_last_checked = 0.0
+_reload: asyncio.Task | None = None
+
+
+async def _load() -> FoodSearchIndex:
+    index = FoodSearchIndex()
+    async for food in Food.find_all():
+        index.add(food)
+    return index
+
+
+async def _current_version() -> int | None:
+    try:
+        return await get_catalog_version()
+    except Exception:
+        return None
+
+
+async def init_food_index():
+    global _index, _version, _last_checked
+    if not settings.food_search_index:
+        return
+    started = time.perf_counter()
+    # Read the version first so a write during the load triggers another reload
+    version = await _current_version()
+    _index = await _load()
+    _version = version
+    _last_checked = time.monotonic()
+    logger.info("Indexed %d foods in %.0f ms", len(_index), (time.perf_counter() - started) * 1000)
+
+
+async def get_food_index() -> FoodSearchIndex | None:
+    """The shared index; None when the index is disabled or not loaded.
+
+    At most once per REFRESH_CHECK_INTERVAL this compares the catalog version
+    and size with what was indexed, and rebuilds in the background if another
+    process (an import, the seed script, another worker) changed the catalog.
+    Requests keep using the current index until the rebuild is swapped in.
+    """
+    global _last_checked, _reload
+    if _index is None:
+        return None
+    if time.monotonic() - _last_checked > REFRESH_CHECK_INTERVAL and _reload is None:
+        _last_checked = time.monotonic()
+        version = await _current_version()
+        stale = version is not None and version != _version
+        if stale or await Food.get_pymongo_collection().estimated_document_count() != len(_index):
+            _reload = asyncio.create_task(_rebuild())
+    return _index
+
+
+async def _rebuild():
+    global _reload
+    try:
+        await init_food_index()
+    except Exception:
+        logger.exception("Failed to rebuild the food index")
+    finally:
+        _reload = None
+
+
+def close_food_index():
+    global _index, _reload
+    if _reload is not None:
+        _reload.cancel()
+        _reload = None
+    _index = None
+
+
+def index_food(food: Food, version: int | None = None):
+    """Add a food written by this process to the index.
+
+    Pass the catalog version returned by the bump for this write; if it is the
+    next version after the indexed one, no rebuild is needed for it.
+    """
+    global _version
+    if _index is None:
+        return
+    _index.add(food)
+    if version is not None and _version is not None and version == _version + 1:
+        _version = version
+
+
+async def find_foods(query: str, limit: int = 10) -> list[Food]:
+    """Best-matching foods for a query, from the index or MongoDB ``$text`` without it."""
+    index = await get_food_index()
+    if index is not None:
+        return index.search(query, limit=limit)[0]
+    return (await text_search(query, limit=limit)).foods
+
+
+async def match_foods(query: str, limit: int = 5) -> list[tuple[Food, float]]:
+    """Ranked candidates for a possibly misspelled food name, with scores in [0, 1].
+
+    Without the index this falls back to ``$text``, whose hits are unscored (1.0).
+    """
+    index = await get_food_index()
+    if index is not None:
+        return index.fuzzy(query, limit=limit)
+    page = await text_search(query, limit=limit)
+    return [(f, 1.0) for f in page.foods]
@@ -0,0 +1,60 @@
+"""Shared write path for food log entries.
+
+All inserts go through ``insert_entries`` so a single entry, a copied day and a
+client batch all cost one ``insert_many`` round trip and keep the derived
+per-day summaries and per-food frequency counts in step. Deletes go through
+``delete_entries`` for the same reason.
+"""
+
+import asyncio
+
+from beanie import PydanticObjectId
+from pymongo.errors import BulkWriteError
+
+from app.models.food_log import FoodLog
+from app.services.daily_summary import record_entries, remove_entries
+from app.services.food_stats import record_food_logs, remove_food_logs
+
+
+async def insert_entries(entries: list[FoodLog]) -> dict[int, str]:
+    """Insert entries with one unordered ``insert_many``.
+
+    Ids are assigned up front so callers can return them. Returns
+    ``{index: error message}`` for entries that failed to write; every other
+    entry is inserted, added to its daily summary and counted for recent foods.
+    """
+    if not entries:
+        return {}
+
+    for entry in entries:
+        if entry.id is None:
+            entry.id = PydanticObjectId()
+
+    errors: dict[int, str] = {}
+    try:
+        await FoodLog.insert_many(entries, ordered=False)
+    except BulkWriteError as e:
+        for err in e.details.get("writeErrors", []):
+            errors[err["index"]] = err.get("errmsg", "Write failed")
+
+    inserted = [e for i, e in enumerate(entries) if i not in errors]
+    await record_entries(inserted)
+    await record_food_logs(inserted)
+    return errors
+
+
+async def delete_entries(entries: list[FoodLog]) -> list[FoodLog]:
+    """Delete entries and take them out of the derived summaries and counts.
+
+    Only documents this call actually deleted are subtracted, as stored, so two
+    concurrent deletes of the same entry (a double click) subtract it once.
+    Returns the deleted entries.
+    """
+    if not entries:
+        return []
+    collection = FoodLog.get_pymongo_collection()
+    docs = await asyncio.gather(*(collection.find_one_and_delete({"_id": e.id}) for e in entries))
+    deleted = [FoodLog.model_validate(doc) for doc in docs if doc is not None]
+    await remove_entries(deleted)
+    await remove_food_logs(deleted)
+    return deleted
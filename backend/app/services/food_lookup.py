@@ -0,0 +1,126 @@
+"""Cached exact-match food lookups, by id and by barcode.
+
+Catalog rows almost never change, so lookups go through an in-process LRU (a
+repeat read costs microseconds), then Redis, then MongoDB. Redis entries record
+the catalog version they were read under and are ignored once it moves on; the
+version and every requested entry come back in a single ``MGET``, and whatever
+is still missing is loaded with one ``$in`` query. Seeing a new version also
+clears the in-process caches, so a write in another process reaches this one
+on its next Redis round trip (or after ``LOCAL_TTL`` at the latest). Misses are
+cached too, since unknown barcodes are scanned again and again. Returned foods
+are shared between requests — treat them as read-only.
+"""
+
+import json
+import logging
+from collections.abc import Awaitable, Callable
+
+from bson import ObjectId
+
+from app.models.food import Food
+from app.redis import get_redis
+from app.services.food_cache import (
+    CATALOG_VERSION_KEY,
+    observe_catalog_version,
+    record_cache_lookup,
+    register_local_cache,
+)
+from app.utils.lru import MISSING, TTLCache
+
+logger = logging.getLogger(__name__)
+
+REDIS_TTL = 86400  # 1 day
+LOCAL_TTL = 300  # bounds staleness when no Redis round trip reveals a new version
+FOOD_LRU_SIZE = 5_000
+BARCODE_LRU_SIZE = 10_000
+
+_by_id = register_local_cache(TTLCache(FOOD_LRU_SIZE, LOCAL_TTL))
+_by_barcode = register_local_cache(TTLCache(BARCODE_LRU_SIZE, LOCAL_TTL))
+
+
+async def _cached(
+    name: str,
+    local: TTLCache,
+    keys: list[str],
+    load: Callable[[list[str]], Awaitable[dict[str, Food]]],
+) -> dict[str, Food | None]:
+    """Resolve ``keys`` through the local LRU, then Redis, then ``load`` for the rest."""
+    found: dict[str, Food | None] = {}
+    missing = []
+    for key in dict.fromkeys(keys):
+        food = local.get(key)
+        if food is MISSING:
+            missing.append(key)
+        else:
+            found[key] = food
+    if not missing:
+        return found
+
+    version = None
+    try:
+        redis_keys = [f"food:{name}:{key}" for key in missing]
+        raw_version, *cached = await get_redis().mget(CATALOG_VERSION_KEY, *redis_keys)
+        version = int(raw_version or 0)
+        observe_catalog_version(version)
+        misses = []
+        for key, raw in zip(missing, cached):
+            entry = json.loads(raw) if raw else None
+            if entry is None or entry["v"] != version:
+                misses.append(key)
+                continue
+            food = Food.model_validate(entry["food"]) if entry["food"] else None
+            found[key] = food
+            local.set(key, food)
+        if len(misses) < len(missing):
+            await record_cache_lookup(name, hit=True, count=len(missing) - len(misses))
+        if misses:
+            await record_cache_lookup(name, hit=False, count=len(misses))
+        missing = misses
+    except Exception:
+        logger.debug("Redis cache miss or error for %s lookup", name)
+    if not missing:
+        return found
+
+    loaded = await load(missing)
+    for key in missing:
+        found[key] = loaded.get(key)
+        local.set(key, found[key])
+    if version is not None:
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            for key in missing:
+                food = found[key]
+                entry = {"v": version, "food": food.model_dump(mode="json") if food else None}
+                pipe.set(f"food:{name}:{key}", json.dumps(entry), ex=REDIS_TTL)
+            await pipe.execute()
+        except Exception:
+            logger.debug("Failed to cache %s lookups", name)
+    return found
+
+
+async def _load_by_id(food_ids: list[str]) -> dict[str, Food]:
+    object_ids = [ObjectId(fid) for fid in food_ids if ObjectId.is_valid(fid)]
+    if not object_ids:
+        return {}
+    foods = await Food.find({"_id": {"$in": object_ids}}).to_list()
+    return {str(f.id): f for f in foods}
+
+
+async def _load_by_barcode(codes: list[str]) -> dict[str, Food]:
+    foods = await Food.find({"barcode": {"$in": codes}}).to_list()
+    return {f.barcode: f for f in foods}
+
+
+async def get_foods(food_ids: list[str]) -> dict[str, Food]:
+    """The foods with these ids, keyed by id; unknown or malformed ids are left out."""
+    found = await _cached("id", _by_id, food_ids, _load_by_id)
+    return {fid: food for fid, food in found.items() if food is not None}
+
+
+async def get_food(food_id: str) -> Food | None:
+    return (await get_foods([food_id])).get(food_id)
+
+
+async def get_food_by_barcode(code: str) -> Food | None:
+    """The food with this normalized barcode, or None."""
+    return (await _cached("barcode", _by_barcode, [code], _load_by_barcode))[code]
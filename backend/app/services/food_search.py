@@ -0,0 +1,100 @@
+"""Paged MongoDB ``$text`` search over the food catalog.
+
+Used when the in-memory index is off. One aggregation returns both the page
+(sorted by ``textScore``) and the total via ``$facet``. Deep pages use an
+opaque keyset cursor on (score, _id) instead of ``$skip``, and the total is
+counted only up to ``SEARCH_TOTAL_CAP`` so a broad query doesn't count the
+whole catalog.
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+
+from beanie import PydanticObjectId
+
+from app.models.food import Food
+
+# Totals above this are reported as the cap with ``total_capped`` set
+SEARCH_TOTAL_CAP = 1000
+
+
+@dataclass
+class SearchPage:
+    foods: list[Food]
+    total: int
+    total_capped: bool = False
+    next_cursor: str | None = None
+
+
+def encode_cursor(data: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data, separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Decode a cursor from ``encode_cursor``; raises ValueError if it is malformed."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(data, dict):
+        raise ValueError("Invalid cursor")
+    return data
+
+
+async def text_search(
+    q: str,
+    limit: int = 20,
+    cursor: str | None = None,
+    offset: int = 0,
+    total_cap: int = SEARCH_TOTAL_CAP,
+) -> SearchPage:
+    """One page of ``$text`` matches, best first.
+
+    Pass the previous page's ``next_cursor`` to continue; ``offset`` is only
+    applied when no cursor is given. Raises ValueError for a malformed cursor.
+    """
+    page_stages: list[dict] = []
+    if cursor:
+        after = decode_cursor(cursor)
+        try:
+            score, last_id = float(after["s"]), PydanticObjectId(after["id"])
+        except Exception as e:
+            raise ValueError("Invalid cursor") from e
+        page_stages.append({"$match": {"$or": [
+            {"score": {"$lt": score}},
+            {"score": score, "_id": {"$gt": last_id}},
+        ]}})
+    page_stages.append({"$sort": {"score": -1, "_id": 1}})
+    if offset and not cursor:
+        page_stages.append({"$skip": offset})
+    # One extra row tells us whether there is a next page
+    page_stages.append({"$limit": limit + 1})
+
+    pipeline = [
+        {"$match": {"$text": {"$search": q}}},
+        {"$addFields": {"score": {"$meta": "textScore"}}},
+        {"$facet": {
+            "page": page_stages,
+            "total": [{"$limit": total_cap + 1}, {"$count": "n"}],
+        }},
+    ]
+    # Use motor collection directly — Beanie's .aggregate() wrapper
+    # incorrectly awaits the cursor creation in newer Motor versions
+    rows = await Food.get_pymongo_collection().aggregate(pipeline).to_list(length=1)
+    result = rows[0] if rows else {"page": [], "total": []}
+
+    docs = result["page"]
+    counted = result["total"][0]["n"] if result["total"] else 0
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        last = docs[-1]
+        next_cursor = encode_cursor({"s": last["score"], "id": str(last["_id"])})
+
+    return SearchPage(
+        foods=[Food.model_validate(d) for d in docs],
+        total=min(counted, total_cap),
+        total_capped=counted > total_cap,
+        next_cursor=next_cursor,
+    )
@@ -0,0 +1,129 @@
+"""Nutrient-profile similarity over the food catalog ("like this, but...").
+
+Each food is a row of its eight tracked nutrients per 100 g. Rows are compared
+after ``log1p`` and dividing each column by its spread across the catalog, so
+sodium in milligrams doesn't drown out fat in grams and a 2 g vs 4 g gap counts
+for more than 52 g vs 54 g. Distances for a whole batch of query foods come from
+one matrix product, and constraints ("more protein than the original") are
+boolean masks over the same matrix.
+
+The matrix is owned by the in-memory search index (``FoodSearchIndex``), so it
+is loaded, extended by ``index_food`` and rebuilt together with it. New rows are
+normalized with the current column scales; the scales themselves are recomputed
+once the catalog has grown by ``RESCALE_GROWTH`` since they were last fitted.
+"""
+
+import numpy as np
+
+from app.models.food import Food
+from app.services.daily_summary import NUTRIENT_KEYS
+
+INITIAL_CAPACITY = 1024
+# Refit the column scales after the catalog grows by this fraction
+RESCALE_GROWTH = 0.1
+
+_COLUMNS = {key: i for i, key in enumerate(NUTRIENT_KEYS)}
+
+
+def per_100g(food: Food) -> list[float]:
+    """The food's nutrients per 100 g, in ``NUTRIENT_KEYS`` order."""
+    factor = 100 / food.serving.grams if food.serving.grams > 0 else 1
+    return [max(getattr(food, key), 0) * factor for key in NUTRIENT_KEYS]
+
+
+def check_nutrients(keys: list[str]) -> list[int]:
+    """Column numbers for nutrient names; raises ValueError for unknown ones."""
+    unknown = [key for key in keys if key not in _COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown nutrient(s): {', '.join(unknown)}")
+    return [_COLUMNS[key] for key in keys]
+
+
+class NutrientMatrix:
+    def __init__(self):
+        cols = len(NUTRIENT_KEYS)
+        # Raw per-100g values (for constraints) and their normalized form (for distances)
+        self._raw = np.zeros((INITIAL_CAPACITY, cols), dtype=np.float32)
+        self._scaled = np.zeros((INITIAL_CAPACITY, cols), dtype=np.float32)
+        self._norms = np.zeros(INITIAL_CAPACITY, dtype=np.float32)
+        self._size = 0
+        self._scale: np.ndarray | None = None
+        self._fitted_size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def set(self, pos: int, food: Food):
+        """Store a food's profile in row ``pos``, growing the matrix as needed."""
+        if pos >= len(self._raw):
+            capacity = max(pos + 1, 2 * len(self._raw))
+            self._raw = _grow(self._raw, capacity)
+            self._scaled = _grow(self._scaled, capacity)
+            self._norms = _grow(self._norms, capacity)
+        self._raw[pos] = per_100g(food)
+        self._size = max(self._size, pos + 1)
+        if self._scale is not None:
+            self._normalize(slice(pos, pos + 1))
+
+    def _normalize(self, rows: slice):
+        self._scaled[rows] = np.log1p(self._raw[rows]) / self._scale
+        self._norms[rows] = np.einsum("ij,ij->i", self._scaled[rows], self._scaled[rows])
+
+    def _fit(self):
+        if self._scale is not None and self._size <= self._fitted_size * (1 + RESCALE_GROWTH):
+            return
+        spread = np.log1p(self._raw[: self._size]).std(axis=0)
+        # A column that is constant across the catalog can't tell foods apart
+        self._scale = np.where(spread > 1e-6, spread, 1).astype(np.float32)
+        self._fitted_size = self._size
+        self._normalize(slice(0, self._size))
+
+    def nearest(
+        self,
+        positions: list[int],
+        k: int = 10,
+        more: list[str] = (),
+        less: list[str] = (),
+    ) -> list[list[tuple[int, float]]]:
+        """The ``k`` closest rows to each of ``positions``, with similarity in (0, 1].
+
+        ``more`` / ``less`` name nutrients a result must have strictly more / less
+        of (per 100 g) than the food it is compared with. A food is never its own
+        neighbour. Raises ValueError for an unknown nutrient name.
+        """
+        more_cols, less_cols = check_nutrients(list(more)), check_nutrients(list(less))
+        if not positions or self._size < 2:
+            return [[] for _ in positions]
+        self._fit()
+        n = self._size
+        scaled, norms, raw = self._scaled[:n], self._norms[:n], self._raw[:n]
+        queries = np.asarray(positions)
+
+        # |a - b|² = |a|² - 2a·b + |b|², for every (query, food) pair at once
+        dist = norms[queries][:, None] - 2 * (scaled[queries] @ scaled.T) + norms[None, :]
+        np.maximum(dist, 0, out=dist)
+        dist[np.arange(len(queries)), queries] = np.inf
+        for col in more_cols:
+            dist[raw[None, :, col] <= raw[queries, col][:, None]] = np.inf
+        for col in less_cols:
+            dist[raw[None, :, col] >= raw[queries, col][:, None]] = np.inf
+
+        k = min(k, n - 1)
+        if k <= 0:
+            return [[] for _ in positions]
+        top = np.argpartition(dist, k - 1, axis=1)[:, :k]
+        results = []
+        for row, candidates in zip(dist, top):
+            ranked = candidates[np.argsort(row[candidates], kind="stable")]
+            results.append([
+                (int(pos), float(1 / (1 + np.sqrt(row[pos]))))
+                for pos in ranked
+                if np.isfinite(row[pos])
+            ])
+        return results
+
+
+def _grow(array: np.ndarray, capacity: int) -> np.ndarray:
+    grown = np.zeros((capacity, *array.shape[1:]), dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
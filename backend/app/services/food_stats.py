@@ -0,0 +1,131 @@
+"""Per-user food frequency table behind "recent foods".
+
+Every food log write adjusts one ``UserFoodStats`` row per (user, food name):
+the log count goes up and the row takes a snapshot of the newest entry so it
+can be re-logged in one tap. ``/foods/recent`` then reads the top rows off an
+index instead of grouping the user's whole history.
+"""
+
+from datetime import datetime
+
+from pymongo import ReplaceOne, UpdateOne
+
+from app.models.food_log import FoodLog
+from app.models.user_food_stats import UserFoodStats
+from app.services.daily_summary import NUTRIENT_KEYS
+
+SNAPSHOT_KEYS = ["food_id", "serving_label", "quantity", *NUTRIENT_KEYS]
+
+
+def _snapshot(entry: FoodLog) -> dict:
+    return {key: getattr(entry, key) for key in SNAPSHOT_KEYS}
+
+
+async def record_food_logs(entries: list[FoodLog]):
+    """Count newly inserted entries and refresh each food's latest snapshot."""
+    grouped: dict[tuple[str, str], list[FoodLog]] = {}
+    for e in entries:
+        grouped.setdefault((e.user_id, e.food_name), []).append(e)
+    if not grouped:
+        return
+
+    ops = []
+    for (user_id, food_name), group in grouped.items():
+        latest = max(group, key=lambda e: e.created_at)
+        ops.append(UpdateOne(
+            {"user_id": user_id, "food_name": food_name},
+            {
+                "$inc": {"log_count": len(group)},
+                "$max": {"last_logged_at": latest.created_at},
+                "$set": _snapshot(latest),
+            },
+            upsert=True,
+        ))
+    await UserFoodStats.get_pymongo_collection().bulk_write(ops, ordered=False)
+
+
+async def remove_food_logs(entries: list[FoodLog]):
+    """Uncount deleted entries, dropping foods the user no longer has logged.
+
+    The snapshot is left as is — it still describes a real serving of the food.
+    """
+    counts: dict[tuple[str, str], int] = {}
+    for e in entries:
+        key = (e.user_id, e.food_name)
+        counts[key] = counts.get(key, 0) + 1
+    if not counts:
+        return
+
+    collection = UserFoodStats.get_pymongo_collection()
+    await collection.bulk_write(
+        [
+            UpdateOne({"user_id": user_id, "food_name": food_name}, {"$inc": {"log_count": -n}})
+            for (user_id, food_name), n in counts.items()
+        ],
+        ordered=False,
+    )
+    await collection.delete_many({
+        "$or": [{"user_id": user_id, "food_name": food_name} for user_id, food_name in counts],
+        "log_count": {"$lte": 0},
+    })
+
+
+async def get_frequent_foods(user_id: str, limit: int) -> list[UserFoodStats]:
+    """The user's most frequently logged foods, most recent first on ties."""
+    return await UserFoodStats.find(
+        UserFoodStats.user_id == user_id,
+    ).sort("-log_count", "-last_logged_at").limit(limit).to_list()
+
+
+# ── Rebuild ──────────────────────────────────────────────
+
+
+async def rebuild_food_stats(user_id: str | None = None, batch_size: int = 1000) -> int:
+    """Recompute the frequency table from food_logs, replacing whatever is stored.
+
+    Returns the number of rows written. Like ``rebuild_summaries``, writes that
+    land while this runs may be overwritten, so run it during low traffic.
+    """
+    match = {"user_id": user_id} if user_id else {}
+    pipeline = [
+        {"$match": match},
+        {"$sort": {"created_at": -1}},
+        {"$group": {
+            "_id": {"user_id": "$user_id", "food_name": "$food_name"},
+            "log_count": {"$sum": 1},
+            "last_logged_at": {"$first": "$created_at"},
+            **{key: {"$first": f"${key}"} for key in SNAPSHOT_KEYS},
+        }},
+    ]
+    collection = UserFoodStats.get_pymongo_collection()
+    now = datetime.utcnow()
+    seen: set[tuple[str, str]] = set()
+
+    ops = []
+    cursor = FoodLog.get_pymongo_collection().aggregate(pipeline, allowDiskUse=True)
+    async for row in cursor:
+        uid, food_name = row["_id"]["user_id"], row["_id"]["food_name"]
+        seen.add((uid, food_name))
+        doc = {
+            "user_id": uid,
+            "food_name": food_name,
+            "log_count": row["log_count"],
+            "last_logged_at": row["last_logged_at"] or now,
+            **{key: row.get(key) for key in SNAPSHOT_KEYS if row.get(key) is not None},
+        }
+        ops.append(ReplaceOne({"user_id": uid, "food_name": food_name}, doc, upsert=True))
+        if len(ops) >= batch_size:
+            await collection.bulk_write(ops, ordered=False)
+            ops = []
+    if ops:
+        await collection.bulk_write(ops, ordered=False)
+
+    # Remove rows for foods that no longer have entries
+    stale = []
+    async for doc in collection.find(match, {"user_id": 1, "food_name": 1}):
+        if (doc["user_id"], doc["food_name"]) not in seen:
+            stale.append(doc["_id"])
+    if stale:
+        await collection.delete_many({"_id": {"$in": stale}})
+
+    return len(seen)
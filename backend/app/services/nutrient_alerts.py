@@ -1,7 +1,7 @@
 from dataclasses import dataclass
-from datetime import date
 
-from app.models.food_log import FoodLog
+from app.services.daily_summary import NUTRIENT_KEYS
+from app.services.day_context import DayContext
 
 
 @dataclass
@@ -29,31 +29,16 @@ LOWER_LIMITS = {
 }
 
 
-async def check_nutrient_alerts(
-    user_id: str,
-    target_date: date | None = None,
-    protein_target: float = 0,
-) -> list[dict]:
+async def check_nutrient_alerts(ctx: DayContext) -> list[dict]:
     """Check daily totals against nutrient limits and return alerts."""
-    target_date = target_date or date.today()
-    entries = await FoodLog.find(
-        FoodLog.user_id == user_id,
-        FoodLog.date == target_date,
-    ).to_list()
+    summary = await ctx.summary()
+    protein_target = ctx.user.targets.protein_g if ctx.user.targets else 0
 
-    if not entries:
+    if summary.entry_count <= 0:
         return []
 
-    totals = {
-        "calories": sum(e.calories for e in entries),
-        "protein_g": sum(e.protein_g for e in entries),
-        "carbs_g": sum(e.carbs_g for e in entries),
-        "fat_g": sum(e.fat_g for e in entries),
-        "fiber_g": sum(e.fiber_g for e in entries),
-        "sugar_g": sum(e.sugar_g for e in entries),
-        "sodium_mg": sum(e.sodium_mg for e in entries),
-        "saturated_fat_g": sum(e.saturated_fat_g for e in entries),
-    }
+    totals = {key: getattr(summary, key) for key in NUTRIENT_KEYS}
+    entry_count = summary.entry_count
 
     alerts: list[dict] = []
 
@@ -87,7 +72,7 @@ async def check_nutrient_alerts(
     # Check fiber (under limit)
     fiber = totals.get("fiber_g", 0)
     fiber_limit = LOWER_LIMITS["fiber_g"]["limit"]
-    if fiber < fiber_limit * 0.5 and len(entries) >= 2:
+    if fiber < fiber_limit * 0.5 and entry_count >= 2:
         alerts.append({
             "nutrient": "fiber_g",
             "label": "Fiber",
@@ -102,7 +87,7 @@ async def check_nutrient_alerts(
     # Check protein vs target (if provided)
     if protein_target > 0:
         protein = totals.get("protein_g", 0)
-        if protein < protein_target * 0.5 and len(entries) >= 2:
+        if protein < protein_target * 0.5 and entry_count >= 2:
             alerts.append({
                 "nutrient": "protein_g",
                 "label": "Protein",
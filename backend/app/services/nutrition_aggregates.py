@@ -0,0 +1,58 @@
+"""Server-side nutrient aggregation over food_logs.
+
+Range views only need per-day (or per-meal) sums, so the grouping is pushed
+into MongoDB and only the grouped rows come back — no entry is loaded into a
+Beanie model.
+"""
+
+from datetime import date
+
+from app.models.food_log import FoodLog
+from app.services.daily_summary import NUTRIENT_KEYS
+from app.utils.dates import mongo_date
+
+
+async def daily_totals(
+    user_id: str,
+    start: date,
+    end: date,
+    by_meal: bool = False,
+) -> list[dict]:
+    """Sum nutrients per day in [start, end], optionally split by meal.
+
+    Returns one dict per group, sorted by date (then meal), with keys ``date``,
+    ``meal`` (only when ``by_meal``), each nutrient in ``NUTRIENT_KEYS`` and
+    ``entry_count``. Days with no entries are omitted.
+    """
+    group_id = {"date": "$date", "meal": "$meal"} if by_meal else {"date": "$date"}
+    pipeline = [
+        {"$match": {
+            "user_id": user_id,
+            "date": {"$gte": mongo_date(start), "$lte": mongo_date(end)},
+        }},
+        {"$group": {
+            "_id": group_id,
+            **{key: {"$sum": f"${key}"} for key in NUTRIENT_KEYS},
+            "entry_count": {"$sum": 1},
+        }},
+        {"$sort": {"_id.date": 1, "_id.meal": 1} if by_meal else {"_id.date": 1}},
+    ]
+    # Use motor collection directly — Beanie's .aggregate() wrapper
+    # incorrectly awaits the cursor creation in newer Motor versions
+    cursor = FoodLog.get_pymongo_collection().aggregate(pipeline)
+
+    rows = []
+    async for r in cursor:
+        row = {"date": r["_id"]["date"].date()}
+        if by_meal:
+            row["meal"] = r["_id"]["meal"]
+        row.update({key: r[key] for key in NUTRIENT_KEYS})
+        row["entry_count"] = r["entry_count"]
+        rows.append(row)
+    return rows
+
+
+def average_totals(days: list[dict]) -> dict[str, float]:
+    """Average each nutrient over the given days (0 for an empty list)."""
+    n = len(days) or 1
+    return {key: sum(d[key] for d in days) / n for key in NUTRIENT_KEYS}
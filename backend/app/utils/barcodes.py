@@ -0,0 +1,18 @@
+import re
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+def normalize_barcode(code: str) -> str | None:
+    """Canonical form of a scanned barcode, or None if it isn't a plausible GTIN.
+
+    UPC-A (12), EAN-13 and GTIN-14 codes for the same product are padded to
+    the same 14 digits, so a UPC scan finds a food imported with its EAN.
+    EAN-8 codes are kept as they are.
+    """
+    digits = _NON_DIGITS.sub("", code or "")
+    if len(digits) == 8:
+        return digits
+    if 12 <= len(digits) <= 14:
+        return digits.zfill(14)
+    return None
@@ -0,0 +1,6 @@
+from datetime import date, datetime, time
+
+
+def mongo_date(d: date) -> datetime:
+    """Encode a `date` the way Beanie stores it (midnight datetime) for raw Motor queries."""
+    return datetime.combine(d, time.min)
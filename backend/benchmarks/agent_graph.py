@@ -0,0 +1,91 @@
+"""Compare per-connection agent graph compilation with the shared compiled graph.
+
+Simulates a storm of chat WebSockets connecting at once. In "per-connection"
+mode each one compiles its own graph, as chat_websocket used to; in "shared"
+mode each one fetches the graph compiled at startup. Reports setup latency
+per connection and the memory each open socket keeps alive for its graph.
+
+Each mode runs in its own subprocess so allocations are measured
+independently. An in-memory checkpointer stands in for MongoDB, so no
+database is needed.
+
+Usage:
+    python -m benchmarks.agent_graph                 # 500 connections, both modes
+    python -m benchmarks.agent_graph --connections 2000
+"""
+
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from app.services.ai.graph import build_agent_graph, get_agent_graph, init_agent_graph
+
+
+async def _connect(mode: str, checkpointer: InMemorySaver, start: asyncio.Event) -> tuple:
+    await start.wait()
+    t0 = time.perf_counter()
+    graph = build_agent_graph(checkpointer) if mode == "per-connection" else get_agent_graph()
+    return graph, time.perf_counter() - t0
+
+
+async def _storm(mode: str, connections: int, checkpointer: InMemorySaver) -> tuple:
+    start = asyncio.Event()
+    tasks = [asyncio.create_task(_connect(mode, checkpointer, start)) for _ in range(connections)]
+    await asyncio.sleep(0)
+    t0 = time.perf_counter()
+    start.set()
+    # Keep every graph referenced, as open sockets would
+    results = await asyncio.gather(*tasks)
+    return results, time.perf_counter() - t0
+
+
+async def _run_child(mode: str, connections: int):
+    checkpointer = InMemorySaver()
+    # Startup work happens before the storm, as it would in lifespan
+    init_agent_graph(checkpointer)
+
+    results, storm = await _storm(mode, connections, checkpointer)
+    setup_ms = sorted(elapsed * 1000 for _, elapsed in results)
+    p99 = setup_ms[min(len(setup_ms) - 1, int(len(setup_ms) * 0.99))]
+    del results
+
+    # Second storm under tracemalloc (which slows it down) just for memory
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    results, _ = await _storm(mode, connections, checkpointer)
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    print(f"{mode:<15} connections={connections} storm={storm:.2f}s "
+          f"setup_mean={statistics.mean(setup_ms):.3f}ms setup_p99={p99:.3f}ms "
+          f"retained_per_socket={retained / connections / 1024:.1f}KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=500)
+    parser.add_argument("--mode", choices=["per-connection", "shared"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        asyncio.run(_run_child(args.mode, args.connections))
+        return
+
+    for mode in ("per-connection", "shared"):
+        subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks.agent_graph",
+                "--mode", mode, "--connections", str(args.connections),
+            ],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Compare peak RSS of the buffered vs streaming food log CSV export.
+
+Each mode runs in its own subprocess so peak RSS is measured independently.
+Rows are synthetic documents shaped like the export cursor yields, so no
+database is needed.
+
+Usage:
+    python -m benchmarks.export_memory              # 100k rows, both modes
+    python -m benchmarks.export_memory --rows 500000
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+from app.services.exports import FOOD_LOG_CSV_HEADER, _csv_row, food_log_csv_chunks
+
+MEALS = ["breakfast", "lunch", "dinner", "snack"]
+
+
+async def _fake_cursor(rows: int):
+    start = datetime(2020, 1, 1)
+    for i in range(rows):
+        yield {
+            "date": start + timedelta(days=i // 8),
+            "meal": MEALS[i % 4],
+            "food_name": f"Food item number {i % 500}",
+            "serving_label": "100g",
+            "quantity": 1.5,
+            "calories": 250.0 + i % 100,
+            "protein_g": 20.5,
+            "carbs_g": 30.25,
+            "fat_g": 8.75,
+            "fiber_g": 4.0,
+            "sugar_g": 6.5,
+            "sodium_mg": 410.0,
+            "saturated_fat_g": 2.25,
+        }
+
+
+async def _buffered(rows: int) -> tuple[int, float]:
+    """The previous implementation: load everything, build one string."""
+    t0 = time.perf_counter()
+    docs = [doc async for doc in _fake_cursor(rows)]
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(FOOD_LOG_CSV_HEADER)
+    for doc in docs:
+        writer.writerow(_csv_row(doc))
+    body = output.getvalue()
+    first_byte = time.perf_counter() - t0
+    return len(body), first_byte
+
+
+async def _streaming(rows: int) -> tuple[int, float]:
+    t0 = time.perf_counter()
+    first_byte = None
+    size = 0
+    async for chunk in food_log_csv_chunks(_fake_cursor(rows)):
+        if first_byte is None:
+            first_byte = time.perf_counter() - t0
+        size += len(chunk)
+    return size, first_byte or 0.0
+
+
+def _run_child(mode: str, rows: int):
+    t0 = time.perf_counter()
+    size, first_byte = asyncio.run(_buffered(rows) if mode == "buffered" else _streaming(rows))
+    elapsed = time.perf_counter() - t0
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+    print(f"{mode:<10} rows={rows} bytes={size} peak_rss={peak_mb:.1f}MB "
+          f"first_byte={first_byte * 1000:.1f}ms total={elapsed:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--mode", choices=["buffered", "streaming"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        _run_child(args.mode, args.rows)
+        return
+
+    for mode in ("buffered", "streaming"):
+        subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks.export_memory",
+                "--mode", mode, "--rows", str(args.rows),
+            ],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Show hit/miss counters for the food caches.
+
+Usage:
+    python -m scripts.cache_stats            # print hit rate per cache
+    python -m scripts.cache_stats --reset    # print, then zero the counters
+"""
+
+import argparse
+import asyncio
+import sys
+
+from app.redis import close_redis, init_redis
+from app.services.food_cache import get_cache_stats, get_catalog_version, reset_cache_stats
+
+
+async def main(args: argparse.Namespace) -> int:
+    await init_redis()
+    try:
+        stats = await get_cache_stats()
+        print(f"Catalog version: {await get_catalog_version()}")
+        if not stats:
+            print("No cache lookups recorded.")
+        for cache, counts in sorted(stats.items()):
+            lookups = counts["hits"] + counts["misses"]
+            rate = counts["hits"] / lookups if lookups else 0
+            print(
+                f"{cache}: {counts['hits']} hits, {counts['misses']} misses "
+                f"({rate:.1%} hit rate)"
+            )
+        if args.reset:
+            await reset_cache_stats()
+            print("Counters reset.")
+        return 0
+    finally:
+        await close_redis()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reset", action="store_true", help="Zero the counters after printing")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,43 @@
+"""Rebuild or verify the per-day nutrient summaries from food_logs.
+
+Usage:
+    python -m scripts.daily_summaries                 # rebuild everything
+    python -m scripts.daily_summaries --user <id>     # rebuild one user
+    python -m scripts.daily_summaries --check         # report drift, exit 1 if any
+"""
+
+import argparse
+import asyncio
+import sys
+
+from app.database import close_database, init_database
+from app.services.daily_summary import check_summaries, rebuild_summaries
+
+
+async def main(args: argparse.Namespace) -> int:
+    await init_database()
+    try:
+        if args.check:
+            mismatches = await check_summaries(args.user)
+            for m in mismatches[:50]:
+                print(
+                    f"{m['user_id']} {m['date']} {m['field']}: "
+                    f"expected {m['expected']:.2f}, stored {m['actual']:.2f}"
+                )
+            if len(mismatches) > 50:
+                print(f"... and {len(mismatches) - 50} more")
+            print(f"{len(mismatches)} mismatch(es) found.")
+            return 1 if mismatches else 0
+
+        days = await rebuild_summaries(args.user)
+        print(f"Rebuilt {days} daily summaries.")
+        return 0
+    finally:
+        await close_database()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user", help="Only process this user_id")
+    parser.add_argument("--check", action="store_true", help="Compare instead of rebuilding")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,64 @@
+"""Bulk-export every user's food logs and weights as typed columnar files.
+
+Usage:
+    python -m scripts.export_columnar --out ./exports                   # Parquet
+    python -m scripts.export_columnar --out ./exports --format arrow    # Arrow IPC stream
+    python -m scripts.export_columnar --out ./exports --start 2025-01-01
+
+Writes food_logs.<format> and weights.<format> with a dictionary-encoded
+user_id column, streaming record batches straight from the cursor.
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import date
+from pathlib import Path
+
+from app.database import close_database, init_database
+from app.services.exports import (
+    COLUMNAR_FORMATS,
+    FOOD_LOG_EXPORT_FIELDS,
+    columnar_chunks,
+    food_log_cursor,
+    weight_cursor,
+)
+
+
+async def _write(path: Path, chunks) -> int:
+    size = 0
+    with path.open("wb") as f:
+        async for chunk in chunks:
+            f.write(chunk)
+            size += len(chunk)
+    return size
+
+
+async def main(args: argparse.Namespace) -> int:
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    await init_database()
+    try:
+        tables = {
+            "food_logs": food_log_cursor(
+                None, args.start, args.end, fields=["user_id", *FOOD_LOG_EXPORT_FIELDS]
+            ),
+            "weights": weight_cursor(None, args.start, args.end),
+        }
+        for table, cursor in tables.items():
+            path = out / f"{table}.{args.format}"
+            chunks = columnar_chunks(cursor, table, args.format, include_user=True)
+            size = await _write(path, chunks)
+            print(f"Wrote {path} ({size / 1024:.1f} KiB)")
+        return 0
+    finally:
+        await close_database()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--format", choices=COLUMNAR_FORMATS, default="parquet")
+    parser.add_argument("--start", type=date.fromisoformat)
+    parser.add_argument("--end", type=date.fromisoformat)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,29 @@
+"""Rebuild the per-user food frequency table behind /foods/recent from food_logs.
+
+Usage:
+    python -m scripts.food_stats                 # rebuild everything
+    python -m scripts.food_stats --user <id>     # rebuild one user
+"""
+
+import argparse
+import asyncio
+import sys
+
+from app.database import close_database, init_database
+from app.services.food_stats import rebuild_food_stats
+
+
+async def main(args: argparse.Namespace) -> int:
+    await init_database()
+    try:
+        rows = await rebuild_food_stats(args.user)
+        print(f"Rebuilt {rows} food frequency rows.")
+        return 0
+    finally:
+        await close_database()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user", help="Only process this user_id")
+    sys.exit(asyncio.run(main(parser.parse_args())))
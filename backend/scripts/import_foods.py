@@ -0,0 +1,84 @@
+"""Import or refresh the food catalog from a USDA FoodData Central dump.
+
+Usage:
+    python -m scripts.import_foods FoodData_Central_branded_food_json.zip.json
+    python -m scripts.import_foods foods.ndjson.gz --format ndjson
+    python -m scripts.import_foods custom_foods.csv --dry-run
+
+Streams the file in batches, upserting by external id and skipping rows whose
+content hash is unchanged, so it is safe to re-run against a live catalog.
+Formats: fdc-json (an FDC JSON download, optionally .gz), ndjson (one FDC food
+per line) and csv (Food field names as headers, external_id required). Branded
+foods' GTIN/UPC codes fill the barcode used by /foods/barcode/{code}.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from app.database import close_database, init_database
+from app.redis import close_redis, init_redis
+from app.services.food_cache import bump_catalog_version
+from app.services.food_import import (
+    IMPORT_BATCH_SIZE,
+    IMPORT_CONCURRENCY,
+    IMPORT_FORMATS,
+    import_foods,
+)
+
+
+def _guess_format(path: Path) -> str:
+    suffixes = [s.lower() for s in path.suffixes if s.lower() != ".gz"]
+    if suffixes and suffixes[-1] == ".csv":
+        return "csv"
+    if suffixes and suffixes[-1] in (".ndjson", ".jsonl"):
+        return "ndjson"
+    return "fdc-json"
+
+
+async def main(args: argparse.Namespace) -> int:
+    path = Path(args.path)
+    if not path.exists():
+        print(f"No such file: {path}")
+        return 1
+    fmt = args.format or _guess_format(path)
+
+    await init_database()
+    await init_redis()
+    try:
+        started = time.perf_counter()
+        stats = await import_foods(
+            path, fmt,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            dry_run=args.dry_run,
+        )
+        if stats.changed and not args.dry_run:
+            # Cached searches and in-memory indexes pick up the new catalog
+            await bump_catalog_version()
+
+        elapsed = time.perf_counter() - started
+        prefix = "[dry run] " if args.dry_run else ""
+        print(
+            f"{prefix}Read {stats.read} rows in {elapsed:.1f}s: {stats.inserted} inserted, "
+            f"{stats.updated} updated, {stats.unchanged} unchanged, "
+            f"{stats.invalid} invalid, {stats.failed} failed."
+        )
+        if stats.barcode_conflicts:
+            print(f"{stats.barcode_conflicts} rows imported without a duplicate barcode.")
+        return 1 if stats.failed else 0
+    finally:
+        await close_redis()
+        await close_database()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="File to import (.gz is decompressed on the fly)")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="Default: guessed from the name")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=IMPORT_CONCURRENCY)
+    parser.add_argument("--dry-run", action="store_true", help="Count changes without writing")
+    sys.exit(asyncio.run(main(parser.parse_args())))
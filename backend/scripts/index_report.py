@@ -0,0 +1,148 @@
+"""Explain the hot per-user queries and fail if any of them scans a whole collection.
+
+Usage:
+    python -m scripts.index_report            # print the winning plan per query
+    python -m scripts.index_report --quiet    # only print failures
+
+Exits with status 1 if any winning plan contains a COLLSCAN stage.
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import date, timedelta
+
+from app.database import close_database, init_database
+from app.models.checklist import ChecklistItem
+from app.models.daily_summary import DailySummary
+from app.models.food_log import FoodLog
+from app.models.user_food_stats import UserFoodStats
+from app.models.weight import Weight
+from app.utils.dates import mongo_date
+
+# Any id works — the planner picks an index based on the query shape, not the data
+SAMPLE_USER_ID = "000000000000000000000000"
+
+
+def _hot_queries() -> list[tuple[str, object, dict, list | None]]:
+    """(label, document model, filter, sort) for every query on a hot path."""
+    today = date.today()
+    week_ago = today - timedelta(days=6)
+    uid = SAMPLE_USER_ID
+    day_range = {"$gte": mongo_date(week_ago), "$lte": mongo_date(today)}
+    return [
+        # food_log.py
+        ("food_log.get_entries", FoodLog,
+         {"user_id": uid, "date": mongo_date(today)}, [("meal", 1), ("created_at", 1)]),
+        ("food_log.copy_meal", FoodLog,
+         {"user_id": uid, "date": mongo_date(today), "meal": "lunch"}, None),
+        ("food_log.totals", DailySummary,
+         {"user_id": uid, "date": mongo_date(today)}, None),
+        ("food_log.range", DailySummary,
+         {"user_id": uid, "date": day_range, "entry_count": {"$gt": 0}}, [("date", 1)]),
+        # reports.py
+        ("reports.weekly food_logs", FoodLog,
+         {"user_id": uid, "date": day_range}, None),
+        ("reports.weekly weights", Weight,
+         {"user_id": uid, "date": day_range}, [("date", 1)]),
+        ("reports.export", FoodLog,
+         {"user_id": uid, "date": day_range}, [("date", 1), ("meal", 1), ("created_at", 1)]),
+        # tools.py
+        ("tools.get_todays_food_log", FoodLog,
+         {"user_id": uid, "date": mongo_date(today)}, [("meal", 1), ("created_at", 1)]),
+        ("tools.get_weight_trend", Weight,
+         {"user_id": uid, "date": {"$gte": mongo_date(week_ago)}}, [("date", 1)]),
+        # foods.py
+        ("foods.get_recent_foods", UserFoodStats,
+         {"user_id": uid}, [("log_count", -1), ("last_logged_at", -1)]),
+        # checklist.py
+        ("checklist.get_checklist", ChecklistItem,
+         {"user_id": uid, "date": mongo_date(today)}, [("created_at", 1)]),
+    ]
+
+
+def _hot_pipelines() -> list[tuple[str, object, list[dict]]]:
+    today = date.today()
+    week_ago = today - timedelta(days=6)
+    uid = SAMPLE_USER_ID
+    return [
+        ("nutrition_aggregates.daily_totals", FoodLog, [
+            {"$match": {
+                "user_id": uid,
+                "date": {"$gte": mongo_date(week_ago), "$lte": mongo_date(today)},
+            }},
+            {"$group": {"_id": {"date": "$date"}, "calories": {"$sum": "$calories"}}},
+        ]),
+        ("food_stats.rebuild_food_stats", FoodLog, [
+            {"$match": {"user_id": uid}},
+            {"$sort": {"created_at": -1}},
+            {"$group": {"_id": "$food_name", "count": {"$sum": 1}}},
+        ]),
+    ]
+
+
+def _winning_plans(explain: dict | list) -> list[dict]:
+    """Collect every `winningPlan` in an explain document (find or aggregate)."""
+    plans = []
+    if isinstance(explain, dict):
+        for key, value in explain.items():
+            if key == "winningPlan":
+                plans.append(value)
+            else:
+                plans.extend(_winning_plans(value))
+    elif isinstance(explain, list):
+        for item in explain:
+            plans.extend(_winning_plans(item))
+    return plans
+
+
+def _stages(plan: dict | list) -> list[str]:
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(_stages(item))
+    return stages
+
+
+async def main(args: argparse.Namespace) -> int:
+    await init_database()
+    try:
+        results: list[tuple[str, list[str]]] = []
+
+        for label, model, query, sort in _hot_queries():
+            cursor = model.get_pymongo_collection().find(query)
+            if sort:
+                cursor = cursor.sort(sort)
+            explain = await cursor.explain()
+            results.append((label, _stages(_winning_plans(explain))))
+
+        for label, model, pipeline in _hot_pipelines():
+            collection = model.get_pymongo_collection()
+            explain = await collection.database.command(
+                "aggregate", collection.name, pipeline=pipeline, explain=True
+            )
+            results.append((label, _stages(_winning_plans(explain))))
+
+        failures = 0
+        for label, stages in results:
+            ok = "COLLSCAN" not in stages
+            failures += not ok
+            if not ok or not args.quiet:
+                status = "ok  " if ok else "FAIL"
+                print(f"[{status}] {label}: {' <- '.join(stages) or 'n/a'}")
+
+        print(f"{len(results)} queries checked, {failures} collection scan(s).")
+        return 1 if failures else 0
+    finally:
+        await close_database()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quiet", action="store_true", help="Only print failing queries")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -13,6 +13,8 @@ from motor.motor_asyncio import AsyncIOMotorClient
 
 from app.config import settings
 from app.models.food import Food, Serving
+from app.redis import close_redis, init_redis
+from app.services.food_cache import bump_catalog_version
 
 
 async def seed():
@@ -50,6 +52,11 @@ async def seed():
 
     await Food.insert_many(foods)
     print(f"Seeded {len(foods)} foods into '{settings.mongodb_database}' database.")
+
+    # Drop cached searches built against the old catalog
+    await init_redis()
+    await bump_catalog_version()
+    await close_redis()
     client.close()
 
 